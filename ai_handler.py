@@ -1,13 +1,50 @@
 import logging
 import json
 import os
+import re
 import pytz
 import google.generativeai as genai
 from config import GEMINI_API_KEY, MODEL_NAME, MAX_MESSAGE_LENGTH
 from datetime import datetime, timedelta
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
+# Calendar action phrases, compiled once into single-pass matchers
+_CALENDAR_CREATE_PATTERNS = (
+    'schedule a', 'add to calendar', 'create meeting', 'book appointment',
+    'set reminder', 'plan meeting', 'i have class at', 'i have meeting at',
+    'schedule meeting', 'book a', 'arrange meeting', 'set up meeting',
+    'create appointment', 'can you set me', 'set me a', 'can you schedule',
+    'can you create', 'can you add', 'can you book', 'set a schedule',
+    'make me a', 'add a', 'put on my calendar', 'schedule for me'
+)
+
+_CALENDAR_DELETE_PATTERNS = (
+    'remove my', 'delete my', 'cancel my', 'clear my schedule', 'remove my schedule',
+    'delete all events', 'clear all events', 'remove all meetings', 'cancel all',
+    'clear my calendar', 'remove everything', 'delete everything',
+    'i want to remove all', 'delete all my', 'remove all of my',
+    'remove all my meetings', 'delete all my meetings', 'cancel all my meetings',
+    'clear all my events', 'remove all my events', 'delete all my events'
+)
+
+# Query patterns that shouldn't trigger actions
+_CALENDAR_QUERY_PATTERNS = (
+    'what\'s on my', 'what do i have', 'am i free', 'do i have', 'check my',
+    'show my', 'when is my', 'any meetings', 'any events today', 'any events tomorrow',
+    'schedule today', 'schedule tomorrow', 'busy today', 'busy tomorrow'
+)
+
+def _compile_phrases(phrases):
+    """Compile literal phrases into one regex equivalent to `any(p in text)`."""
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases))
+
+_CALENDAR_CREATE_RE = _compile_phrases(_CALENDAR_CREATE_PATTERNS)
+_CALENDAR_DELETE_RE = _compile_phrases(_CALENDAR_DELETE_PATTERNS)
+_CALENDAR_QUERY_RE = _compile_phrases(_CALENDAR_QUERY_PATTERNS)
+_CALENDAR_ACTION_RE = _compile_phrases(_CALENDAR_CREATE_PATTERNS + _CALENDAR_DELETE_PATTERNS)
+
 class AIHandler:
     """Handles AI conversations using Google Gemini."""
     
@@ -234,20 +271,24 @@ Respond naturally and helpfully, as if you're a knowledgeable friend who knows B
             logger.error(f"Error generating AI response: {e}")
             raise
     
-    def split_long_message(self, message: str) -> list:
+    def split_long_message(self, message: str) -> Iterator[str]:
         """
         Split long messages into chunks that fit Telegram's limits.
         
+        Chunks are yielded lazily so the first one can be sent before the
+        rest of the message has been split.
+        
         Args:
             message (str): The message to split
             
-        Returns:
-            list: List of message chunks
+        Yields:
+            str: Message chunks, in order
         """
         if len(message) <= MAX_MESSAGE_LENGTH:
-            return [message]
+            yield message
+            return
         
-        chunks = []
+        chunk_count = 0
         current_pos = 0
         
         while current_pos < len(message):
@@ -255,7 +296,8 @@ Respond naturally and helpfully, as if you're a knowledgeable friend who knows B
             end_pos = current_pos + MAX_MESSAGE_LENGTH
             
             if end_pos >= len(message):
-                chunks.append(message[current_pos:])
+                chunk_count += 1
+                yield message[current_pos:]
                 break
             
             # Try to break at a newline
@@ -267,11 +309,11 @@ Respond naturally and helpfully, as if you're a knowledgeable friend who knows B
                     # Force break at character limit
                     break_pos = end_pos
             
-            chunks.append(message[current_pos:break_pos])
+            chunk_count += 1
+            yield message[current_pos:break_pos]
             current_pos = break_pos + 1 if break_pos < end_pos else break_pos
         
-        logger.info(f"Split message into {len(chunks)} chunks")
-        return chunks
+        logger.info(f"Split message into {chunk_count} chunks")
 
     def set_calendar_handler(self, calendar_handler):
         """Set the calendar handler for calendar-aware responses."""
@@ -290,38 +332,16 @@ Respond naturally and helpfully, as if you're a knowledgeable friend who knows B
         """
         message_lower = user_message.lower()
         
-        # More specific action patterns
-        create_patterns = [
-            'schedule a', 'add to calendar', 'create meeting', 'book appointment',
-            'set reminder', 'plan meeting', 'i have class at', 'i have meeting at',
-            'schedule meeting', 'book a', 'arrange meeting', 'set up meeting',
-            'create appointment', 'can you set me', 'set me a', 'can you schedule',
-            'can you create', 'can you add', 'can you book', 'set a schedule',
-            'make me a', 'add a', 'put on my calendar', 'schedule for me'
-        ]
-        
-        delete_patterns = [
-            'remove my', 'delete my', 'cancel my', 'clear my schedule', 'remove my schedule',
-            'delete all events', 'clear all events', 'remove all meetings', 'cancel all',
-            'clear my calendar', 'remove everything', 'delete everything',
-            'i want to remove all', 'delete all my', 'remove all of my',
-            'remove all my meetings', 'delete all my meetings', 'cancel all my meetings',
-            'clear all my events', 'remove all my events', 'delete all my events'
-        ]
-        
-        # Exclude query patterns that shouldn't trigger actions
-        query_patterns = [
-            'what\'s on my', 'what do i have', 'am i free', 'do i have', 'check my',
-            'show my', 'when is my', 'any meetings', 'any events today', 'any events tomorrow',
-            'schedule today', 'schedule tomorrow', 'busy today', 'busy tomorrow'
-        ]
+        # Cheap pre-filter: without a create/delete phrase there is no action
+        if not _CALENDAR_ACTION_RE.search(message_lower):
+            return {}
         
         # First check if it's clearly a query (should not trigger action)
-        if any(pattern in message_lower for pattern in query_patterns):
+        if _CALENDAR_QUERY_RE.search(message_lower):
             return {}
         
         # Check for deletion actions
-        if any(pattern in message_lower for pattern in delete_patterns):
+        if _CALENDAR_DELETE_RE.search(message_lower):
             # Check if it's specifically targeting meetings/events type vs everything
             if 'all my meetings' in message_lower or 'all my events' in message_lower:
                 # Extract the specific type to delete
@@ -352,7 +372,7 @@ Respond naturally and helpfully, as if you're a knowledgeable friend who knows B
                 }
         
         # Check for creation actions
-        if any(pattern in message_lower for pattern in create_patterns):
+        if _CALENDAR_CREATE_RE.search(message_lower):
             return {
                 'action': 'create'
             }
@@ -704,14 +724,14 @@ Respond naturally and helpfully, as if you're a knowledgeable friend who knows B
         """
         try:
             # Import reminder service here to avoid circular imports
-            from reminder_service import ReminderService
+            from reminder_service import get_reminder_service
             
-            reminder_service = ReminderService()
+            reminder_service = get_reminder_service()
             action = action_info.get('action')
             
             if action == 'set_reminder':
                 # Parse the reminder request using AI
-                reminder_data = await reminder_service.parse_reminder_request(user_message)
+                reminder_data = await reminder_service.queue_reminder_request(user_message)
                 
                 if not reminder_data:
                     return ("❌ **Could not parse reminder request**\n\n"
@@ -659,13 +659,15 @@ Examples:
         with open(self.reminder_file, 'w') as f:
             json.dump(list(self.sent_reminders), f)
 
-    async def get_events_needing_reminders(self, minutes_before: int = 15, at_event_time: bool = True) -> List[Dict[str, Any]]:
+    async def get_events_needing_reminders(self, minutes_before: int = 15, at_event_time: bool = True,
+                                           now: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Get events that need reminders to be sent.
         
         Args:
             minutes_before (int): Minutes before event to send reminder
             at_event_time (bool): Whether to also send reminder at event time
+            now (datetime, optional): Current time, computed if not given
             
         Returns:
             List[Dict]: Events needing reminders with reminder types
@@ -674,7 +676,7 @@ Examples:
             return []
         
         try:
-            now = datetime.now(self.timezone)
+            now = now.astimezone(self.timezone) if now else datetime.now(self.timezone)
             # Look ahead for events in the next hour
             end_time = now + timedelta(hours=1)
             
@@ -26,6 +26,8 @@ CONNECT_TIMEOUT = 30.0
 READ_TIMEOUT = 30.0
 WRITE_TIMEOUT = 30.0
 POOL_TIMEOUT = 30.0
+CONNECTION_POOL_SIZE = 256  # Outgoing requests that can run at once
+GET_UPDATES_POOL_SIZE = 16  # Separate pool so polling never waits on sends
 
 # Scheduling Settings
 DAILY_MESSAGE_HOUR = 17  # 5 PM
@@ -49,6 +51,7 @@ ENABLE_EMAIL_AUTOMATION = ENABLE_EMAIL
 # URLs and Endpoints
 WEATHER_API_URL = "http://api.weatherstack.com/current"
 QUOTES_API_URL = "https://api.quotable.io/random"
+QUOTES_BATCH_API_URL = "https://api.quotable.io/quotes/random"
 FACTS_API_URL = "https://uselessfacts.jsph.pl/random.json"
 
 # Validate required environment variables
@@ -72,4 +75,22 @@ def validate_config():
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
+    # Scheduling values are only used when jobs are set up, so check them here
+    invalid_settings = []
+    
+    if not 0 <= DAILY_MESSAGE_HOUR < 24:
+        invalid_settings.append(f"DAILY_MESSAGE_HOUR={DAILY_MESSAGE_HOUR} (must be 0-23)")
+    
+    if not 0 <= DAILY_MESSAGE_MINUTE < 60:
+        invalid_settings.append(f"DAILY_MESSAGE_MINUTE={DAILY_MESSAGE_MINUTE} (must be 0-59)")
+    
+    if REMINDER_CHECK_INTERVAL_MINUTES <= 0:
+        invalid_settings.append(f"REMINDER_CHECK_INTERVAL_MINUTES={REMINDER_CHECK_INTERVAL_MINUTES} (must be positive)")
+    
+    if REMINDER_MINUTES_BEFORE < 0:
+        invalid_settings.append(f"REMINDER_MINUTES_BEFORE={REMINDER_MINUTES_BEFORE} (must not be negative)")
+    
+    if invalid_settings:
+        raise ValueError(f"Invalid configuration: {', '.join(invalid_settings)}")
+    
     return True 
\ No newline at end of file
@@ -346,17 +346,20 @@ class EmailService:
         pending_list.sort(key=lambda x: x['scheduled_time'])
         return pending_list
     
-    async def check_and_send_scheduled_emails(self) -> List[Dict[str, Any]]:
+    async def check_and_send_scheduled_emails(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Check for emails that need to be sent and send them.
         
+        Args:
+            now (datetime, optional): Current time, computed if not given
+        
         Returns:
             List[Dict]: List of sent emails with results
         """
         if not self.is_available():
             return []
         
-        current_time = datetime.now(self.timezone)
+        current_time = now.astimezone(self.timezone) if now else datetime.now(self.timezone)
         pending_emails = self.load_pending_emails()
         sent_emails = []
         
@@ -3,18 +3,17 @@
 
 # Import all handlers that main.py needs
 from .basic_commands import (
-    start, help_command, stop_messages, status, 
-    get_user_chat_id, set_user_chat_id
+    start, help_command, stop_messages, status
 )
 
 from .external_services import (
     weather_command, quote_command, fact_command, joke_command,
-    motivation_command, meditation_command
+    motivation_command, meditation_command, get_services
 )
 
 from .calendar_commands import (
     calendar_setup, calendar_auth, calendar_events, create_meeting,
-    reminder_settings, get_calendar_handler
+    reminder_settings, get_calendar_handler, warmup_calendar
 )
 
 from .ai_chat import (
@@ -22,11 +21,12 @@ from .ai_chat import (
 )
 
 from .callback_handlers import (
-    handle_callback_query
+    handle_callback_query, get_callback_handlers
 )
 
 from .scheduled_tasks import (
-    send_daily_hi, send_calendar_reminders, send_scheduled_emails, send_scheduled_reminders
+    send_daily_hi, send_calendar_reminders, send_scheduled_emails, send_scheduled_reminders,
+    send_reminder
 )
 
 from .email_commands import (
@@ -34,28 +34,43 @@ from .email_commands import (
     handle_email_confirmation, get_email_service
 )
 
+from .error_handlers import (
+    on_error
+)
+
+from .concurrency import (
+    per_chat
+)
+
 # Export all functions
 __all__ = [
     # Basic commands
-    'start', 'help_command', 'stop_messages', 'status', 'get_user_chat_id', 'set_user_chat_id',
+    'start', 'help_command', 'stop_messages', 'status',
     
     # AI chat
     'handle_message', 'get_ai_handler',
     
     # External services
     'weather_command', 'quote_command', 'fact_command', 'joke_command',
-    'motivation_command', 'meditation_command',
+    'motivation_command', 'meditation_command', 'get_services',
     
     # Calendar integration
     'calendar_setup', 'calendar_auth', 'calendar_events', 'create_meeting',
-    'reminder_settings', 'get_calendar_handler',
+    'reminder_settings', 'get_calendar_handler', 'warmup_calendar',
     
     # Email automation
     'email_command', 'pending_emails_command', 'cancel_email_command',
     
     # Callback handlers
-    'handle_callback_query',
+    'handle_callback_query', 'get_callback_handlers',
+    
+    # Error handling
+    'on_error',
+    
+    # Concurrency
+    'per_chat',
     
     # Scheduled tasks
-    'send_daily_hi', 'send_calendar_reminders', 'send_scheduled_emails', 'send_scheduled_reminders'
+    'send_daily_hi', 'send_calendar_reminders', 'send_scheduled_emails', 'send_scheduled_reminders',
+    'send_reminder'
 ] 
\ No newline at end of file
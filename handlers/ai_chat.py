@@ -4,11 +4,44 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.constants import ChatAction
 from ai_handler import AIHandler
+from handlers.calendar_commands import get_calendar_handler
 
 logger = logging.getLogger(__name__)
 
 # Initialize AI handler
 ai_handler = AIHandler()
+calendar_handler = get_calendar_handler()
+
+# Gap between starting the sends of consecutive chunks of one long reply
+CHUNK_SEND_INTERVAL = 0.3
+
+# References to fire-and-forget tasks so they are not garbage collected early
+_background_tasks = set()
+
+def show_typing(message) -> None:
+    """Send a typing indicator without waiting for Telegram to acknowledge it."""
+    task = asyncio.create_task(message.reply_chat_action(ChatAction.TYPING))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def send_long_message(message, text: str, **kwargs) -> None:
+    """
+    Reply to a message with text that may exceed Telegram's length limit.
+    
+    The first chunk is awaited so it lands before anything else. Later
+    chunks are started CHUNK_SEND_INTERVAL apart without waiting for the
+    previous one to finish, then awaited together.
+    """
+    chunks = ai_handler.split_long_message(text)
+    await message.reply_text(next(chunks), **kwargs)
+    
+    tasks = []
+    for chunk in chunks:
+        await asyncio.sleep(CHUNK_SEND_INTERVAL)
+        tasks.append(asyncio.create_task(message.reply_text(chunk, **kwargs)))
+    
+    if tasks:
+        await asyncio.gather(*tasks)
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle general text messages."""
@@ -18,26 +51,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         
         logger.info(f"Received message from {user_name}: {user_message}")
         
-        # Import calendar handler here to avoid circular imports
-        from handlers.calendar_commands import get_calendar_handler
-        calendar_handler = get_calendar_handler()
-        
         # Let AI detect and handle calendar actions first
         if calendar_handler.is_authenticated:
             calendar_action = await ai_handler.detect_calendar_action(user_message)
             
             if calendar_action:
-                await update.message.reply_chat_action(ChatAction.TYPING)
+                show_typing(update.message)
                 
                 # Execute the calendar action
                 result = await ai_handler.execute_calendar_action(calendar_action, user_message)
                 
                 # Send the result
-                chunks = ai_handler.split_long_message(result)
-                for chunk in chunks:
-                    await update.message.reply_text(chunk, parse_mode='Markdown')
-                    if len(chunks) > 1:
-                        await asyncio.sleep(0.5)
+                await send_long_message(update.message, result, parse_mode='Markdown')
                 
                 logger.info(f"Calendar action executed for {user_name}: {calendar_action.get('action')}")
                 return
@@ -46,17 +71,13 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         reminder_action = await ai_handler.detect_reminder_action(user_message)
         
         if reminder_action:
-            await update.message.reply_chat_action(ChatAction.TYPING)
+            show_typing(update.message)
             
             # Execute the reminder action
             result = await ai_handler.execute_reminder_action(reminder_action, user_message)
             
             # Send the result
-            chunks = ai_handler.split_long_message(result)
-            for chunk in chunks:
-                await update.message.reply_text(chunk, parse_mode='Markdown')
-                if len(chunks) > 1:
-                    await asyncio.sleep(0.5)
+            await send_long_message(update.message, result, parse_mode='Markdown')
             
             logger.info(f"Reminder action executed for {user_name}: {reminder_action.get('action')}")
             return
@@ -65,35 +86,25 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         email_action = await ai_handler.detect_email_action(user_message)
         
         if email_action:
-            await update.message.reply_chat_action(ChatAction.TYPING)
+            show_typing(update.message)
             
             # Execute the email action
             result = await ai_handler.execute_email_action(email_action, user_message)
             
             # Send the result
-            chunks = ai_handler.split_long_message(result)
-            for chunk in chunks:
-                await update.message.reply_text(chunk, parse_mode='Markdown')
-                if len(chunks) > 1:
-                    await asyncio.sleep(0.5)
+            await send_long_message(update.message, result, parse_mode='Markdown')
             
             logger.info(f"Email action executed for {user_name}: {email_action.get('action')}")
             return
         
         # If no calendar or email action detected, handle as regular AI conversation
-        await update.message.reply_chat_action(ChatAction.TYPING)
+        show_typing(update.message)
         
         # Generate AI response with calendar context
         response = await ai_handler.generate_response(user_message, user_name)
         
-        # Split long messages
-        chunks = ai_handler.split_long_message(response)
-        
-        # Send response chunks
-        for chunk in chunks:
-            await update.message.reply_text(chunk)
-            if len(chunks) > 1:
-                await asyncio.sleep(0.5)  # Brief pause between chunks
+        # Send response, split into chunks if needed
+        await send_long_message(update.message, response)
         
         logger.info(f"AI response sent to {user_name}")
         
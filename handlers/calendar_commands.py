@@ -4,13 +4,64 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ChatAction
 from calendar_handler import CalendarHandler
+from handlers.replies import respond
 from config import ENABLE_CALENDAR_REMINDERS, REMINDER_MINUTES_BEFORE, REMINDER_CHECK_INTERVAL_MINUTES, REMINDER_AT_EVENT_TIME
 
 logger = logging.getLogger(__name__)
 
-# Initialize calendar handler
+# Initialize calendar handler (credentials are loaded by warmup_calendar at startup)
 calendar_handler = CalendarHandler()
-calendar_handler.load_credentials()
+
+# Reminder settings only depend on config, so the message is built once
+if ENABLE_CALENDAR_REMINDERS:
+    _REMINDER_AT_TEXT = "I'll also text you when events start" if REMINDER_AT_EVENT_TIME else "No notifications at event start time"
+    _REMINDER_SETTINGS_DETAILS = (
+        "📱 **How it works:**\n"
+        f"• I'll text you {REMINDER_MINUTES_BEFORE} minutes before each event\n"
+        f"• {_REMINDER_AT_TEXT}\n"
+        f"• I check for upcoming events every {REMINDER_CHECK_INTERVAL_MINUTES} minutes\n\n"
+        "💡 **To change settings, edit config.py and restart the bot**"
+    )
+else:
+    _REMINDER_SETTINGS_DETAILS = (
+        "ℹ️ Calendar reminders are currently disabled.\n"
+        "To enable them, set ENABLE_CALENDAR_REMINDERS = True in config.py"
+    )
+
+_REMINDER_SETTINGS_MESSAGE = (
+    "⚙️ **Calendar Reminder Settings**\n\n"
+    f"🔔 **Reminders Enabled:** {'✅ Yes' if ENABLE_CALENDAR_REMINDERS else '❌ No'}\n"
+    f"⏰ **Reminder Time:** {REMINDER_MINUTES_BEFORE} minutes before events\n"
+    f"🕐 **At Event Time:** {'✅ Yes' if REMINDER_AT_EVENT_TIME else '❌ No'}\n"
+    f"🔄 **Check Interval:** Every {REMINDER_CHECK_INTERVAL_MINUTES} minutes\n\n"
+    f"{_REMINDER_SETTINGS_DETAILS}"
+)
+
+# Event start time shown in reminder test results, e.g. "02:30 PM"
+_EVENT_TIME_FORMAT = '%I:%M %p'
+
+# Inline keyboards, built once at import time
+_CREATE_CONFIRM_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("✅ Create Event", callback_data="create_confirmed"),
+        InlineKeyboardButton("❌ Cancel", callback_data="create_cancelled")
+    ]
+])
+
+_REMINDERS_MARKUP_DISABLED = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📅 View Calendar", callback_data="calendar_events"),
+        InlineKeyboardButton("➕ Add Event", callback_data="quick_add_event")
+    ]
+])
+
+_REMINDERS_MARKUP_ENABLED = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🧪 Test Reminders", callback_data="test_reminders")],
+    [
+        InlineKeyboardButton("📅 View Calendar", callback_data="calendar_events"),
+        InlineKeyboardButton("➕ Add Event", callback_data="quick_add_event")
+    ]
+])
 
 async def calendar_setup(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Set up Google Calendar authentication."""
@@ -48,29 +99,16 @@ async def calendar_events(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """Show upcoming calendar events."""
     try:
         # Handle both regular messages and callback queries
-        if update.callback_query:
-            query = update.callback_query
-            await query.edit_message_text("📅 Fetching your upcoming events...")
-            message_handler = query.message
-        else:
-            await update.message.reply_text("📅 Fetching your upcoming events...")
-            message_handler = update.message
+        if not update.callback_query:
+            await update.message.reply_chat_action(ChatAction.TYPING)
         
         events_text = await calendar_handler.get_upcoming_events()
         
-        if update.callback_query:
-            await query.edit_message_text(events_text, parse_mode='Markdown')
-        else:
-            await message_handler.reply_text(events_text, parse_mode='Markdown')
+        await respond(update, events_text, parse_mode='Markdown')
         
     except Exception as e:
         logger.error(f"Calendar events error: {e}")
-        error_msg = f"❌ Error fetching events: {str(e)}"
-        
-        if update.callback_query:
-            await update.callback_query.edit_message_text(error_msg)
-        else:
-            await update.message.reply_text(error_msg)
+        await respond(update, f"❌ Error fetching events: {str(e)}")
 
 async def create_meeting(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Create a calendar event from natural language input."""
@@ -94,7 +132,6 @@ async def create_meeting(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         
         # Show typing indicator
         await update.message.reply_chat_action(ChatAction.TYPING)
-        await update.message.reply_text("🤖 Understanding your meeting request...")
         
         # Parse the meeting request
         meeting_details = await calendar_handler.parse_meeting_request(meeting_request)
@@ -119,21 +156,12 @@ async def create_meeting(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         
         confirmation_text += "\nShall I create this event in your calendar?"
         
-        # Create confirmation buttons
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Create Event", callback_data=f"create_confirmed"),
-                InlineKeyboardButton("❌ Cancel", callback_data="create_cancelled")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         # Store meeting details in context for confirmation
         context.user_data['pending_meeting'] = meeting_details
         
         await update.message.reply_text(
             confirmation_text, 
-            reply_markup=reply_markup, 
+            reply_markup=_CREATE_CONFIRM_MARKUP, 
             parse_mode='Markdown'
         )
         
@@ -181,48 +209,10 @@ async def reminder_settings(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             return
         
-        # Show current settings
-        settings_message = (
-            "⚙️ **Calendar Reminder Settings**\n\n"
-            f"🔔 **Reminders Enabled:** {'✅ Yes' if ENABLE_CALENDAR_REMINDERS else '❌ No'}\n"
-            f"⏰ **Reminder Time:** {REMINDER_MINUTES_BEFORE} minutes before events\n"
-            f"🕐 **At Event Time:** {'✅ Yes' if REMINDER_AT_EVENT_TIME else '❌ No'}\n"
-            f"🔄 **Check Interval:** Every {REMINDER_CHECK_INTERVAL_MINUTES} minutes\n\n"
-        )
-        
-        if ENABLE_CALENDAR_REMINDERS:
-            reminder_at_text = "I'll also text you when events start" if REMINDER_AT_EVENT_TIME else "No notifications at event start time"
-            settings_message += (
-                "📱 **How it works:**\n"
-                f"• I'll text you {REMINDER_MINUTES_BEFORE} minutes before each event\n"
-                f"• {reminder_at_text}\n"
-                f"• I check for upcoming events every {REMINDER_CHECK_INTERVAL_MINUTES} minutes\n\n"
-                "💡 **To change settings, edit config.py and restart the bot**"
-            )
-        else:
-            settings_message += (
-                "ℹ️ Calendar reminders are currently disabled.\n"
-                "To enable them, set ENABLE_CALENDAR_REMINDERS = True in config.py"
-            )
-        
-        # Test reminders button
-        keyboard = []
-        if ENABLE_CALENDAR_REMINDERS:
-            keyboard.append([
-                InlineKeyboardButton("🧪 Test Reminders", callback_data="test_reminders")
-            ])
-        
-        keyboard.append([
-            InlineKeyboardButton("📅 View Calendar", callback_data="calendar_events"),
-            InlineKeyboardButton("➕ Add Event", callback_data="quick_add_event")
-        ])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await update.message.reply_text(
-            settings_message,
+            _REMINDER_SETTINGS_MESSAGE,
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=_REMINDERS_MARKUP_ENABLED if ENABLE_CALENDAR_REMINDERS else _REMINDERS_MARKUP_DISABLED
         )
         
     except Exception as e:
@@ -233,19 +223,11 @@ async def test_reminders_manually(update: Update, context: ContextTypes.DEFAULT_
     """Manually test the reminder system."""
     try:
         if not calendar_handler.is_authenticated:
-            error_msg = "❌ Calendar not authenticated"
-            if update.callback_query:
-                await update.callback_query.edit_message_text(error_msg)
-            elif update.message:
-                await update.message.reply_text(error_msg)
+            await respond(update, "❌ Calendar not authenticated")
             return
         
         # Send initial message
-        initial_msg = "🧪 Testing reminder system..."
-        if update.callback_query:
-            await update.callback_query.edit_message_text(initial_msg)
-        elif update.message:
-            await update.message.reply_text(initial_msg)
+        await respond(update, "🧪 Testing reminder system...")
         
         # Get events that would need reminders (with a wider time window for testing)
         events_needing_reminders = await calendar_handler.get_events_needing_reminders(
@@ -260,35 +242,45 @@ async def test_reminders_manually(update: Update, context: ContextTypes.DEFAULT_
                 "💡 Try creating a test event for a few minutes from now to see how reminders work!"
             )
         else:
-            result_message = f"✅ **Reminder Test Complete**\n\n"
-            result_message += f"Found {len(events_needing_reminders)} upcoming events that would trigger reminders:\n\n"
+            parts = [
+                "✅ **Reminder Test Complete**\n\n",
+                f"Found {len(events_needing_reminders)} upcoming events that would trigger reminders:\n\n"
+            ]
             
             for event in events_needing_reminders:
-                time_str = event['start_datetime'].strftime('%I:%M %p')
-                result_message += f"📅 **{event['title']}** at {time_str}\n"
-                result_message += f"   ⏰ Reminder type: {event['reminder_type']}\n"
-                result_message += f"   🕐 In {event['minutes_until']} minutes\n\n"
+                time_str = event['start_datetime'].strftime(_EVENT_TIME_FORMAT)
+                parts.append(
+                    f"📅 **{event['title']}** at {time_str}\n"
+                    f"   ⏰ Reminder type: {event['reminder_type']}\n"
+                    f"   🕐 In {event['minutes_until']} minutes\n\n"
+                )
             
-            result_message += "🔄 **The reminder system is working and will automatically send notifications!**"
+            parts.append("🔄 **The reminder system is working and will automatically send notifications!**")
+            result_message = "".join(parts)
         
         # Send result message
-        if update.callback_query:
-            await update.callback_query.edit_message_text(result_message, parse_mode='Markdown')
-        elif update.message:
-            await update.message.reply_text(result_message, parse_mode='Markdown')
+        await respond(update, result_message, parse_mode='Markdown')
         
     except Exception as e:
         logger.error(f"Error testing reminders: {e}")
-        error_msg = f"❌ Error testing reminders: {str(e)}"
         
         try:
-            if update.callback_query:
-                await update.callback_query.edit_message_text(error_msg)
-            elif update.message:
-                await update.message.reply_text(error_msg)
+            await respond(update, f"❌ Error testing reminders: {str(e)}")
         except Exception as fallback_error:
             logger.error(f"Error sending error message: {fallback_error}")
 
+async def warmup_calendar() -> bool:
+    """
+    Load saved calendar credentials without blocking the event loop.
+    
+    Reading the token file and refreshing an expired token are blocking
+    I/O, so this runs in a worker thread once the bot has started.
+    
+    Returns:
+        bool: True if credentials loaded successfully
+    """
+    return await asyncio.to_thread(calendar_handler.load_credentials)
+
 def get_calendar_handler():
     """Get the calendar handler instance."""
     return calendar_handler 
\ No newline at end of file
@@ -1,7 +1,7 @@
 import logging
-import asyncio
+import re
 from telegram import Update
-from telegram.ext import ContextTypes
+from telegram.ext import ContextTypes, CallbackQueryHandler
 from handlers.external_services import (
     weather_command, quote_command, fact_command, joke_command, 
     motivation_command, meditation_command
@@ -9,45 +9,49 @@ from handlers.external_services import (
 from handlers.calendar_commands import (
     calendar_events, handle_meeting_confirmation, test_reminders_manually
 )
-from handlers.ai_chat import get_ai_handler
+from handlers.ai_chat import get_ai_handler, send_long_message
 from handlers.email_commands import handle_email_confirmation
+from handlers.concurrency import per_chat
 
 logger = logging.getLogger(__name__)
 
+# Simple button callbacks mapped straight to their command handlers
+_CALLBACK_DISPATCH = {
+    "weather": weather_command,
+    "quote": quote_command,
+    "fact": fact_command,
+    "joke": joke_command,
+    "motivation": motivation_command,
+    "meditation": meditation_command,
+    "calendar_events": calendar_events,
+    "test_reminders": test_reminders_manually,
+}
+
+_CONFIRM_KEYS = {"create_confirmed", "create_cancelled", "quick_create"}
+
+def _answer_first(callback):
+    """Wrap a command handler so the button press is acknowledged first."""
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.answer()
+        await callback(update, context)
+    return wrapper
+
+async def handle_email_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle email confirmation button presses (callback data "email_<action>_<id>")."""
+    parts = update.callback_query.data.split("_")
+    if len(parts) >= 3:
+        action = parts[1]  # "send" or "cancel"
+        message_id = "_".join(parts[2:])  # Rest is message ID
+        await handle_email_confirmation(update, context, action, message_id)
+    else:
+        await update.callback_query.answer()
+
 async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle inline keyboard button presses."""
+    """Handle inline keyboard button presses not covered by a dedicated handler."""
     query = update.callback_query
     await query.answer()
     
-    # Email confirmation callbacks
-    if query.data.startswith("email_"):
-        parts = query.data.split("_")
-        if len(parts) >= 3:
-            action = parts[1]  # "send" or "cancel"
-            message_id = "_".join(parts[2:])  # Rest is message ID
-            await handle_email_confirmation(update, context, action, message_id)
-        return
-    
-    if query.data == "weather":
-        await weather_command(update, context)
-    elif query.data == "quote":
-        await quote_command(update, context)
-    elif query.data == "fact":
-        await fact_command(update, context)
-    elif query.data == "joke":
-        await joke_command(update, context)
-    elif query.data == "motivation":
-        await motivation_command(update, context)
-    elif query.data == "meditation":
-        await meditation_command(update, context)
-    elif query.data == "calendar_events":
-        await calendar_events(update, context)
-    elif query.data == "test_reminders":
-        await test_reminders_manually(update, context)
-    # Calendar-related callbacks
-    elif query.data in ["create_confirmed", "create_cancelled", "quick_create"]:
-        await handle_meeting_confirmation(update, context)
-    elif query.data == "just_chat":
+    if query.data == "just_chat":
         # Handle original message as regular chat
         original_message = context.user_data.get('original_message', '')
         if original_message:
@@ -60,11 +64,30 @@ async def handle_callback_query(update: Update, context: ContextTypes.DEFAULT_TY
             # Generate AI response for original message
             ai_handler = get_ai_handler()
             response = await ai_handler.generate_response(original_message, update.effective_user.first_name)
-            chunks = ai_handler.split_long_message(response)
-            
-            for chunk in chunks:
-                await query.message.reply_text(chunk)
-                if len(chunks) > 1:
-                    await asyncio.sleep(0.5)
+            await send_long_message(query.message, response)
         else:
-            await query.edit_message_text("💬 Let's continue our conversation!") 
\ No newline at end of file
+            await query.edit_message_text("💬 Let's continue our conversation!")
+
+def get_callback_handlers():
+    """
+    Build the callback query handlers for all inline buttons.
+    
+    Each known button gets its own pattern-matched handler so PTB does the
+    dispatch; handle_callback_query is registered last as the catch-all.
+    Every callback is wrapped with per_chat to keep presses from one chat
+    in order.
+    
+    Returns:
+        list: CallbackQueryHandler instances in registration order
+    """
+    handlers = [
+        CallbackQueryHandler(per_chat(_answer_first(callback)), pattern=f"^{re.escape(data)}$")
+        for data, callback in _CALLBACK_DISPATCH.items()
+    ]
+    handlers.append(CallbackQueryHandler(
+        per_chat(handle_meeting_confirmation),
+        pattern="^(" + "|".join(sorted(_CONFIRM_KEYS)) + ")$"
+    ))
+    handlers.append(CallbackQueryHandler(per_chat(handle_email_callback), pattern="^email_"))
+    handlers.append(CallbackQueryHandler(per_chat(handle_callback_query)))
+    return handlers
\ No newline at end of file
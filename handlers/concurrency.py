@@ -0,0 +1,34 @@
+import asyncio
+import functools
+import weakref
+from telegram import Update
+from telegram.ext import ContextTypes
+
+# One lock per chat: updates run concurrently across chats but in order within one.
+# Entries disappear once no running or waiting update holds the lock.
+_chat_locks = weakref.WeakValueDictionary()
+
+def per_chat(callback):
+    """
+    Wrap a handler callback so updates from the same chat run one at a time.
+    
+    Args:
+        callback: Async handler taking (update, context)
+        
+    Returns:
+        The wrapped callback
+    """
+    @functools.wraps(callback)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        chat = update.effective_chat
+        if chat is None:
+            return await callback(update, context)
+        
+        lock = _chat_locks.get(chat.id)
+        if lock is None:
+            lock = _chat_locks[chat.id] = asyncio.Lock()
+        
+        async with lock:
+            return await callback(update, context)
+    
+    return wrapper
@@ -0,0 +1,18 @@
+import logging
+from telegram import Update
+from telegram.ext import ContextTypes
+
+logger = logging.getLogger(__name__)
+
+async def on_error(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Log errors raised by handlers and let the user know something went wrong."""
+    logger.error(f"Error while handling update: {context.error}", exc_info=context.error)
+
+    if isinstance(update, Update) and update.effective_message:
+        try:
+            await update.effective_message.reply_text(
+                f"❌ **Error:** {str(context.error)}",
+                parse_mode='Markdown'
+            )
+        except Exception as reply_error:
+            logger.error(f"Error sending error message: {reply_error}")
@@ -0,0 +1,51 @@
+from telegram import MessageEntity
+
+_MARKDOWN_ENTITY_TYPES = {
+    '*': MessageEntity.BOLD,
+    '_': MessageEntity.ITALIC,
+    '`': MessageEntity.CODE,
+}
+
+def markdown_to_entities(text: str) -> tuple:
+    """
+    Convert legacy Telegram Markdown into plain text and message entities.
+
+    Follows the same rules Telegram applies for parse_mode='Markdown': a
+    marker opens an entity that runs until the same marker appears again,
+    other markers inside it are literal, and empty entities are dropped.
+    Used to pre-parse static messages once at import time.
+
+    Args:
+        text (str): Markdown text using *bold*, _italic_ and `code`
+
+    Returns:
+        tuple: (plain_text, list of MessageEntity)
+    """
+    plain_chars = []
+    entities = []
+    offset = 0  # Telegram measures offsets in UTF-16 code units
+    open_marker = None
+    entity_start = 0
+
+    for char in text:
+        if char in _MARKDOWN_ENTITY_TYPES and (open_marker is None or char == open_marker):
+            if open_marker is None:
+                open_marker = char
+                entity_start = offset
+            else:
+                if offset > entity_start:
+                    entities.append(MessageEntity(
+                        type=_MARKDOWN_ENTITY_TYPES[open_marker],
+                        offset=entity_start,
+                        length=offset - entity_start
+                    ))
+                open_marker = None
+            continue
+
+        plain_chars.append(char)
+        offset += len(char.encode('utf-16-le')) // 2
+
+    if open_marker is not None:
+        raise ValueError(f"Can't find end of the '{open_marker}' entity")
+
+    return ''.join(plain_chars), entities
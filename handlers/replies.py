@@ -0,0 +1,35 @@
+import logging
+import asyncio
+from telegram import Update
+from telegram.error import RetryAfter
+
+logger = logging.getLogger(__name__)
+
+async def _send(update: Update, text: str, **kwargs):
+    """Edit the button message for callback queries, otherwise reply."""
+    query = update.callback_query
+    if query is not None:
+        return await query.edit_message_text(text, **kwargs)
+    return await update.message.reply_text(text, **kwargs)
+
+async def respond(update: Update, text: str, **kwargs):
+    """
+    Send text back to the user for both commands and button presses.
+
+    If Telegram rate-limits the request, wait the requested time and
+    retry once.
+
+    Args:
+        update (Update): The incoming update
+        text (str): Message text
+        **kwargs: Passed through to reply_text/edit_message_text
+
+    Returns:
+        Message: The sent or edited message
+    """
+    try:
+        return await _send(update, text, **kwargs)
+    except RetryAfter as e:
+        logger.warning(f"Rate limited by Telegram, retrying in {e.retry_after}s")
+        await asyncio.sleep(e.retry_after)
+        return await _send(update, text, **kwargs)
@@ -1,82 +1,98 @@
 import logging
+import asyncio
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from config import ENABLE_ENHANCED_DAILY, REMINDER_MINUTES_BEFORE, REMINDER_AT_EVENT_TIME
-from handlers.basic_commands import get_user_chat_id
 from handlers.calendar_commands import get_calendar_handler
-from services import ExternalServices
+from handlers.external_services import services
+from reminder_service import get_reminder_service
 
 logger = logging.getLogger(__name__)
 
+# Stay under Telegram's global limit of ~30 messages per second
+_SEND_SEMAPHORE = asyncio.Semaphore(25)
+
+# Personalized quick action buttons for Bunkheang, built once at import time
+_DAILY_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📅 Tomorrow's Schedule", callback_data="calendar_events"),
+        InlineKeyboardButton("🌤️ Weather Update", callback_data="weather")
+    ],
+    [
+        InlineKeyboardButton("💪 Boost My Energy", callback_data="motivation"),
+        InlineKeyboardButton("🧘 Help Me Unwind", callback_data="meditation")
+    ]
+])
+
 async def send_daily_hi(application) -> None:
     """Send the enhanced daily message with weather, quote, and greeting."""
-    USER_CHAT_ID = get_user_chat_id()
-    if not USER_CHAT_ID:
+    user_chat_id = application.bot_data.get("user_chat_id")
+    if not user_chat_id:
         return
     
     try:
-        services = ExternalServices()
-        
         # Get time-based greeting
         greeting = services.get_greeting_based_on_time()
         
         # Start building the daily message
-        daily_message = f"{greeting} Bunkheang! 👋\n\n"
-        daily_message += "🤖 **Your daily check-in is here, my friend!**\n\n"
+        parts = [
+            f"{greeting} Bunkheang! 👋\n\n",
+            "🤖 **Your daily check-in is here, my friend!**\n\n"
+        ]
         
         if ENABLE_ENHANCED_DAILY:
+            # Fetch weather and quote concurrently
+            weather_data, quote_data = await asyncio.gather(
+                services.get_weather(),
+                services.get_inspirational_quote(),
+                return_exceptions=True
+            )
+            
             # Add weather information for Phnom Penh
-            weather_data = await services.get_weather()
-            if weather_data["success"]:
-                daily_message += "🌤️ **Phnom Penh Weather (for your plans):**\n"
-                daily_message += f"🌡️ {weather_data['temperature']}°C - {weather_data['description']}\n"
-                daily_message += f"💧 Humidity: {weather_data['humidity']}% (perfect for campus or coding!)\n\n"
+            if isinstance(weather_data, Exception):
+                logger.error(f"Error fetching weather for daily message: {weather_data}")
+            elif weather_data["success"]:
+                parts.append(
+                    "🌤️ **Phnom Penh Weather (for your plans):**\n"
+                    f"🌡️ {weather_data['temperature']}°C - {weather_data['description']}\n"
+                    f"💧 Humidity: {weather_data['humidity']}% (perfect for campus or coding!)\n\n"
+                )
             
             # Add inspirational quote
-            quote_data = await services.get_inspirational_quote()
-            if quote_data["success"]:
-                daily_message += "✨ **Today's motivation boost for you:**\n"
-                daily_message += f"*\"{quote_data['text']}\"*\n"
-                daily_message += f"— {quote_data['author']}\n\n"
-        
-        daily_message += "💬 How did your day go, Bunkheang? Made progress on your projects? Need help with anything? I'm here for whatever you need - coding problems, planning tomorrow, or just a chat!"
-        
-        # Create personalized quick action buttons for Bunkheang
-        keyboard = [
-            [
-                InlineKeyboardButton("📅 Tomorrow's Schedule", callback_data="calendar_events"),
-                InlineKeyboardButton("🌤️ Weather Update", callback_data="weather")
-            ],
-            [
-                InlineKeyboardButton("💪 Boost My Energy", callback_data="motivation"),
-                InlineKeyboardButton("🧘 Help Me Unwind", callback_data="meditation")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+            if isinstance(quote_data, Exception):
+                logger.error(f"Error fetching quote for daily message: {quote_data}")
+            elif quote_data["success"]:
+                parts.append(
+                    "✨ **Today's motivation boost for you:**\n"
+                    f"*\"{quote_data['text']}\"*\n"
+                    f"— {quote_data['author']}\n\n"
+                )
+        
+        parts.append("💬 How did your day go, Bunkheang? Made progress on your projects? Need help with anything? I'm here for whatever you need - coding problems, planning tomorrow, or just a chat!")
         
         await application.bot.send_message(
-            chat_id=USER_CHAT_ID,
-            text=daily_message,
+            chat_id=user_chat_id,
+            text="".join(parts),
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=_DAILY_MARKUP
         )
         
-        logger.info(f"Daily personal check-in sent to Bunkheang (Chat ID: {USER_CHAT_ID})")
+        logger.info(f"Daily personal check-in sent to Bunkheang (Chat ID: {user_chat_id})")
         
     except Exception as e:
         logger.error(f"Error sending daily message: {e}")
         # Fallback to simple message
         try:
             await application.bot.send_message(
-                chat_id=USER_CHAT_ID,
+                chat_id=user_chat_id,
                 text="Hey Bunkheang! 👋 Hope your day was productive!\n\n💬 Your assistant is here if you need anything - just let me know!"
             )
         except Exception as fallback_error:
             logger.error(f"Error sending fallback daily message: {fallback_error}")
 
-async def send_calendar_reminders(application) -> None:
+async def send_calendar_reminders(application, now=None) -> None:
     """Check for upcoming events and send reminders."""
-    USER_CHAT_ID = get_user_chat_id()
-    if not USER_CHAT_ID:
+    user_chat_id = application.bot_data.get("user_chat_id")
+    if not user_chat_id:
         return
     
     try:
@@ -87,29 +103,36 @@ async def send_calendar_reminders(application) -> None:
         # Get events needing reminders
         events_needing_reminders = await calendar_handler.get_events_needing_reminders(
             minutes_before=REMINDER_MINUTES_BEFORE,
-            at_event_time=REMINDER_AT_EVENT_TIME
+            at_event_time=REMINDER_AT_EVENT_TIME,
+            now=now
         )
         
-        # Send reminders for each event
-        for event in events_needing_reminders:
-            try:
-                # Format reminder message
-                reminder_message = calendar_handler.format_reminder_message(event)
-                
-                # Send reminder
+        format_reminder_message = calendar_handler.format_reminder_message
+        mark_reminder_sent = calendar_handler.mark_reminder_sent
+        
+        async def _send_event_reminder(event):
+            async with _SEND_SEMAPHORE:
                 await application.bot.send_message(
-                    chat_id=USER_CHAT_ID,
-                    text=reminder_message,
+                    chat_id=user_chat_id,
+                    text=format_reminder_message(event),
                     parse_mode='Markdown'
                 )
-                
-                # Mark reminder as sent
-                calendar_handler.mark_reminder_sent(event['reminder_id'])
-                
-                logger.info(f"Calendar reminder sent: {event['title']} ({event['reminder_type']})")
-                
-            except Exception as e:
-                logger.error(f"Error sending individual reminder for {event['title']}: {e}")
+        
+        # Send all reminders concurrently, then record which ones went out
+        results = await asyncio.gather(
+            *(_send_event_reminder(event) for event in events_needing_reminders),
+            return_exceptions=True
+        )
+        
+        for event, result in zip(events_needing_reminders, results):
+            if isinstance(result, Exception):
+                logger.error("Error sending individual reminder for %s: %s", event['title'], result)
+                continue
+            
+            # Mark reminder as sent
+            mark_reminder_sent(event['reminder_id'])
+            
+            logger.info("Calendar reminder sent: %s (%s)", event['title'], event['reminder_type'])
         
         # Clean up old reminders occasionally
         if len(events_needing_reminders) > 0:
@@ -118,7 +141,7 @@ async def send_calendar_reminders(application) -> None:
     except Exception as e:
         logger.error(f"Error in calendar reminder check: {e}")
 
-async def send_scheduled_emails(application) -> None:
+async def send_scheduled_emails(application, now=None) -> None:
     """Check for scheduled emails and send them."""
     try:
         # Import here to avoid circular imports
@@ -130,14 +153,14 @@ async def send_scheduled_emails(application) -> None:
             return
         
         # Check and send scheduled emails
-        sent_emails = await email_service.check_and_send_scheduled_emails()
+        sent_emails = await email_service.check_and_send_scheduled_emails(now)
         
         # Notify user about sent emails (optional)
-        USER_CHAT_ID = get_user_chat_id()
-        if sent_emails and USER_CHAT_ID:
+        user_chat_id = application.bot_data.get("user_chat_id")
+        if sent_emails and user_chat_id:
             for email_info in sent_emails:
                 if email_info['result']['success']:
-                    logger.info(f"Scheduled email sent: {email_info['subject']} to {email_info['recipient']}")
+                    logger.info("Scheduled email sent: %s to %s", email_info['subject'], email_info['recipient'])
                     
                     # Optional: Send notification to user
                     notification = (
@@ -148,14 +171,14 @@ async def send_scheduled_emails(application) -> None:
                     
                     try:
                         await application.bot.send_message(
-                            chat_id=USER_CHAT_ID,
+                            chat_id=user_chat_id,
                             text=notification,
                             parse_mode='Markdown'
                         )
                     except Exception as notify_error:
-                        logger.error(f"Error sending email notification: {notify_error}")
+                        logger.error("Error sending email notification: %s", notify_error)
                 else:
-                    logger.error(f"Failed to send scheduled email: {email_info['result']['message']}")
+                    logger.error("Failed to send scheduled email: %s", email_info['result']['message'])
         
         # Cleanup old emails occasionally (once a day)
         import random
@@ -165,41 +188,59 @@ async def send_scheduled_emails(application) -> None:
     except Exception as e:
         logger.error(f"Error in scheduled email check: {e}")
 
-async def send_scheduled_reminders(application) -> None:
-    """Check for and send scheduled personal reminders."""
-    USER_CHAT_ID = get_user_chat_id()
-    if not USER_CHAT_ID:
+async def _deliver_reminder(application, user_chat_id, reminder_service, reminder) -> None:
+    """Send one claimed personal reminder to the user."""
+    try:
+        # Format the friendly reminder message
+        formatted_message = reminder_service.format_reminder_message(reminder['reminder_text'])
+        
+        # Send reminder
+        await application.bot.send_message(
+            chat_id=user_chat_id,
+            text=formatted_message
+        )
+        
+        logger.info("Personal reminder sent: %s", reminder['reminder_id'])
+        
+    except Exception as e:
+        logger.error("Error sending individual reminder %s: %s", reminder['reminder_id'], e)
+
+async def send_reminder(application, reminder_id: str) -> None:
+    """Send a single personal reminder when its timer fires."""
+    user_chat_id = application.bot_data.get("user_chat_id")
+    if not user_chat_id:
+        return
+    
+    reminder_service = get_reminder_service()
+    reminder = reminder_service.claim_reminder(reminder_id)
+    
+    if reminder:
+        await _deliver_reminder(application, user_chat_id, reminder_service, reminder)
+
+async def send_scheduled_reminders(application, now=None) -> None:
+    """
+    Send any personal reminders whose timers were missed.
+    
+    Reminders normally fire through send_reminder; this periodic sweep is a
+    safety net.
+    """
+    user_chat_id = application.bot_data.get("user_chat_id")
+    if not user_chat_id:
         return
     
     try:
-        # Import reminder service here to avoid circular imports
-        from reminder_service import ReminderService
-        
-        reminder_service = ReminderService()
+        reminder_service = get_reminder_service()
         
         # Get reminders that need to be sent
-        reminders_to_send = await reminder_service.check_and_send_scheduled_reminders()
+        reminders_to_send = await reminder_service.check_and_send_scheduled_reminders(now)
         
         # Send each reminder
         for reminder in reminders_to_send:
-            try:
-                # Format the friendly reminder message
-                formatted_message = reminder_service.format_reminder_message(reminder['reminder_text'])
-                
-                # Send reminder
-                await application.bot.send_message(
-                    chat_id=USER_CHAT_ID,
-                    text=formatted_message
-                )
-                
-                logger.info(f"Personal reminder sent: {reminder['reminder_id']}")
-                
-            except Exception as e:
-                logger.error(f"Error sending individual reminder {reminder['reminder_id']}: {e}")
+            await _deliver_reminder(application, user_chat_id, reminder_service, reminder)
         
-        # Clean up old reminders occasionally
-        if len(reminders_to_send) > 0:
-            reminder_service.cleanup_old_reminders()
+        # Timers deliver most reminders, so prune old records on every sweep
+        # rather than only when the sweep itself sent something
+        reminder_service.cleanup_old_reminders()
             
     except Exception as e:
-        logger.error(f"Error in scheduled reminder check: {e}") 
\ No newline at end of file
+        logger.error(f"Error in scheduled reminder check: {e}")
@@ -8,8 +8,9 @@ and send daily reminders.
 
 import logging
 import asyncio
+import signal
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
+from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
 # Import our modules
 from config import (
@@ -18,18 +19,27 @@ from config import (
     READ_TIMEOUT, 
     WRITE_TIMEOUT, 
     POOL_TIMEOUT,
+    CONNECTION_POOL_SIZE,
+    GET_UPDATES_POOL_SIZE,
     validate_config
 )
 from handlers import (
     start, help_command, stop_messages, status, handle_message,
     weather_command, quote_command, fact_command, joke_command,
-    motivation_command, meditation_command, handle_callback_query,
+    motivation_command, meditation_command, get_callback_handlers,
     calendar_setup, calendar_auth, calendar_events, create_meeting,
-    reminder_settings, get_calendar_handler, get_ai_handler,
-    email_command, pending_emails_command, cancel_email_command
+    reminder_settings, get_calendar_handler, get_ai_handler, warmup_calendar,
+    email_command, pending_emails_command, cancel_email_command, on_error,
+    per_chat, get_services
 )
 from scheduler import BotScheduler
 
+# uvloop is a faster drop-in event loop; it is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -37,6 +47,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Longest startup waits for the weather and quote caches to fill, in seconds
+CACHE_WARMUP_TIMEOUT = 5
+
+# Bot commands and the handlers that serve them
+_COMMAND_HANDLERS = (
+    # Basic commands
+    ("start", start),
+    ("help", help_command),
+    ("stop", stop_messages),
+    ("status", status),
+    
+    # Enhanced feature commands
+    ("weather", weather_command),
+    ("quote", quote_command),
+    ("fact", fact_command),
+    ("joke", joke_command),
+    ("motivation", motivation_command),
+    ("meditation", meditation_command),
+    
+    # Calendar integration commands
+    ("calendar_setup", calendar_setup),
+    ("calendar_auth", calendar_auth),
+    ("calendar_events", calendar_events),
+    ("create_meeting", create_meeting),
+    ("reminders", reminder_settings),
+    
+    # Email automation commands
+    ("email", email_command),
+    ("pending_emails", pending_emails_command),
+    ("cancel_email", cancel_email_command),
+)
+
 class TelegramBot:
     """Main bot class that orchestrates all components."""
     
@@ -44,6 +86,7 @@ class TelegramBot:
         """Initialize the bot with all components."""
         self.application = None
         self.scheduler = BotScheduler()
+        self._stop_event = None
         
     def create_application(self):
         """Create and configure the Telegram application."""
@@ -54,51 +97,35 @@ class TelegramBot:
             .read_timeout(READ_TIMEOUT)
             .write_timeout(WRITE_TIMEOUT)
             .pool_timeout(POOL_TIMEOUT)
+            .connection_pool_size(CONNECTION_POOL_SIZE)
+            .get_updates_connection_pool_size(GET_UPDATES_POOL_SIZE)
+            .get_updates_pool_timeout(POOL_TIMEOUT)
+            .concurrent_updates(True)
             .build()
         )
         
-        # Add command handlers
-        self.application.add_handler(CommandHandler("start", start))
-        self.application.add_handler(CommandHandler("help", help_command))
-        self.application.add_handler(CommandHandler("stop", stop_messages))
-        self.application.add_handler(CommandHandler("status", status))
-        
-        # Add enhanced feature commands
-        self.application.add_handler(CommandHandler("weather", weather_command))
-        self.application.add_handler(CommandHandler("quote", quote_command))
-        self.application.add_handler(CommandHandler("fact", fact_command))
-        self.application.add_handler(CommandHandler("joke", joke_command))
-        self.application.add_handler(CommandHandler("motivation", motivation_command))
-        self.application.add_handler(CommandHandler("meditation", meditation_command))
-        
-        # Add calendar integration commands
-        self.application.add_handler(CommandHandler("calendar_setup", calendar_setup))
-        self.application.add_handler(CommandHandler("calendar_auth", calendar_auth))
-        self.application.add_handler(CommandHandler("calendar_events", calendar_events))
-        self.application.add_handler(CommandHandler("create_meeting", create_meeting))
-        self.application.add_handler(CommandHandler("reminders", reminder_settings))
+        # Add command handlers; block=False lets slow commands run as tasks
+        for name, callback in _COMMAND_HANDLERS:
+            self.application.add_handler(CommandHandler(name, callback, block=False))
         
-        # Add email automation commands
-        self.application.add_handler(CommandHandler("email", email_command))
-        self.application.add_handler(CommandHandler("pending_emails", pending_emails_command))
-        self.application.add_handler(CommandHandler("cancel_email", cancel_email_command))
+        # Add callback query handlers for inline buttons
+        for handler in get_callback_handlers():
+            self.application.add_handler(handler)
         
-        # Add callback query handler for inline buttons
-        self.application.add_handler(CallbackQueryHandler(handle_callback_query))
-        
-        # Add message handler for AI conversations (should be last)
+        # Add message handler for AI conversations (should be last),
+        # keeping messages from one chat in order under concurrent updates
         self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message)
+            MessageHandler(filters.TEXT & ~filters.COMMAND, per_chat(handle_message))
         )
         
+        # Report handler errors in one place instead of per-handler try/except
+        self.application.add_error_handler(on_error)
+        
         logger.info("Application created and all handlers registered")
     
     async def start_bot(self):
         """Start the bot and all its components."""
         try:
-            # Validate configuration
-            validate_config()
-            
             # Create application
             self.create_application()
             
@@ -106,6 +133,9 @@ class TelegramBot:
             await self.application.bot.delete_webhook(drop_pending_updates=True)
             logger.info("Cleaned up existing webhook")
             
+            # Load saved calendar credentials off the event loop
+            await warmup_calendar()
+            
             # Connect calendar handler to AI handler for calendar-aware responses
             calendar_handler = get_calendar_handler()
             ai_handler = get_ai_handler()
@@ -119,14 +149,35 @@ class TelegramBot:
             await self.application.initialize()
             logger.info("Enhanced bot initialized successfully")
             
+            # Fill the external API caches so the first user request is a hit
+            try:
+                await asyncio.wait_for(get_services().warm_up(), timeout=CACHE_WARMUP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Cache warm-up timed out, continuing startup")
+            
             await self.application.start()
-            await self.application.updater.start_polling(allowed_updates=Update.ALL_TYPES, drop_pending_updates=True)
+            # Long-poll for up to 20s and only for the update types we handle
+            await self.application.updater.start_polling(
+                timeout=20,
+                bootstrap_retries=-1,
+                allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
+                drop_pending_updates=True
+            )
             logger.info("Enhanced bot started and polling...")
             
-            # Keep running until interrupted
+            # Keep running until a stop signal arrives
+            self._stop_event = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, self._stop_event.set)
+                except NotImplementedError:
+                    # Windows: fall back to KeyboardInterrupt
+                    pass
+            
             try:
-                while True:
-                    await asyncio.sleep(1)
+                await self._stop_event.wait()
+                logger.info("Received stop signal, shutting down...")
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal, shutting down...")
                 
@@ -146,6 +197,8 @@ class TelegramBot:
                 await self.application.stop()
                 await self.application.shutdown()
             
+            await get_services().close()
+            
             logger.info("Bot cleanup completed")
             
         except Exception as e:
@@ -154,8 +207,14 @@ class TelegramBot:
 def main():
     """Main function to run the bot."""
     try:
+        # Fail fast on bad configuration before starting the event loop
+        validate_config()
+        
         bot = TelegramBot()
-        asyncio.run(bot.start_bot())
+        if uvloop:
+            uvloop.run(bot.start_bot())
+        else:
+            asyncio.run(bot.start_bot())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
@@ -5,30 +5,126 @@ This module handles personal reminder/notification scheduling for direct Telegra
 """
 
 import logging
+import asyncio
 import json
 import os
+import random
 import re
-import pytz
+import stat
+import tempfile
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from zoneinfo import ZoneInfo
+from typing import Dict, List, Optional, Any, Callable, Awaitable
 
-import google.generativeai as genai
 from config import GEMINI_API_KEY
 
+# orjson is much faster when installed; fall back to the stdlib otherwise
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data, indent=2).encode()
+
 logger = logging.getLogger(__name__)
 
+# Remind time formats requested in the Gemini prompt
+_DATETIME_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2})')
+_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+_TIME_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
+# Markdown code fences Gemini sometimes wraps its JSON in
+_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+# Prompt for parsing numbered reminder requests, filled in with str.format
+_REMINDER_PROMPT_TEMPLATE = """
+Parse each numbered reminder request below and extract the following information:
+
+CURRENT TIME: {current_time} (Phnom Penh time, Cambodia - UTC+7)
+
+- reminder_text: What to remind about (the main message content)
+- remind_time: When to send the reminder (use current time above for calculations)
+- priority: urgent, normal, or low
+
+User requests:
+{user_requests}
+
+REMIND_TIME RULES:
+- If user says "now", "immediately", "right away" → use "now"
+- If user specifies time today → use "YYYY-MM-DD HH:MM" format with today's date
+- If user says "tomorrow at X" → use tomorrow's date with specified time
+- If user says "in X minutes/hours" → calculate from current time
+- If user says "at X PM/AM" without date → assume today if time hasn't passed, tomorrow if it has
+- If user says specific date → use that date
+- If no time specified → use "now"
+
+EXAMPLES:
+"at 2PM today, you have to notify me that I need to do home work" → remind_time: "2025-05-31 14:00", reminder_text: "Time to do your homework!"
+"remind me in 30 minutes to call mom" → calculate 30 minutes from current time, reminder_text: "Time to call mom!"
+"at 1:20PM notify me that I need to play chess" → remind_time: "2025-05-31 13:20", reminder_text: "Time to play chess!"
+"tomorrow at 9 AM remind me about the meeting" → remind_time: "2025-06-01 09:00", reminder_text: "Don't forget about the meeting!"
+
+Return ONLY a JSON array with exactly {count} objects, one per request in the same order, each with these fields:
+{{
+    "reminder_text": "Friendly reminder message to send",
+    "remind_time": "now" or "YYYY-MM-DD HH:MM",
+    "priority": "normal"
+}}
+"""
+
+# Reminder requests arriving this close together share one Gemini call
+PARSE_BATCH_WINDOW = 0.05
+PARSE_BATCH_MAX = 16
+
+# Cap on Gemini calls running at once in worker threads
+GEMINI_CONCURRENCY = 8
+
+# Added to the end of every reminder message
+_ENCOURAGING_MESSAGES = (
+    "You know, balancing work and studies can be tricky, but you've totally got this!",
+    "Perfect timing! Hope you're having a productive day!",
+    "Time flies when you're coding, doesn't it? 😄",
+    "Another step towards your goals - keep it up!",
+    "Hope this reminder finds you in a good mood!",
+    "You're doing great managing everything, Bunkheang!",
+    "Let's tackle this next task together!",
+    "Remember, every small step counts towards your big dreams!"
+)
+
 class ReminderService:
     """Handles personal reminder scheduling and delivery via Telegram messages."""
     
     def __init__(self):
         """Initialize the reminder service."""
-        self.timezone = pytz.timezone('Asia/Phnom_Penh')
+        self.timezone = ZoneInfo('Asia/Phnom_Penh')
         
         # File to store pending reminders
         self.pending_reminders_file = 'pending_reminders.json'
         
+        # In-memory copy of the file; every change is written straight through
+        self._cache = None
+        
+        # Timers that fire each pending reminder at its scheduled time
+        self._handles = {}
+        self._fire_tasks = set()
+        self._on_due = None
+        
+        # Reminder requests waiting to be parsed together
+        self._parse_queue = []
+        self._parse_flush_task = None
+        self._gemini_sem = asyncio.Semaphore(GEMINI_CONCURRENCY)
+        
         # Initialize Gemini for reminder parsing
         if GEMINI_API_KEY:
+            # Imported here so the heavy SDK only loads when it will be used
+            import google.generativeai as genai
             genai.configure(api_key=GEMINI_API_KEY)
             self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
         else:
@@ -47,74 +143,104 @@ class ReminderService:
         Returns:
             Dict: Parsed reminder details or None if parsing fails
         """
-        if not self.gemini_model:
-            return None
+        results = await self.parse_reminder_requests_batch([user_message])
+        return results[0]
+    
+    async def queue_reminder_request(self, user_message: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a reminder request together with any others arriving at the same time.
+        
+        Requests are collected for up to PARSE_BATCH_WINDOW seconds, or until
+        PARSE_BATCH_MAX are waiting, and then parsed with a single Gemini call.
+        Messages within one chat are already handled one at a time, so a batch
+        deliberately combines requests from different chats.
+        
+        Args:
+            user_message (str): Natural language reminder request
+            
+        Returns:
+            Dict: Parsed reminder details or None if parsing fails
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._parse_queue.append((user_message, future))
+        
+        if len(self._parse_queue) >= PARSE_BATCH_MAX:
+            if self._parse_flush_task:
+                self._parse_flush_task.cancel()
+            self._parse_flush_task = asyncio.create_task(self._flush_parse_queue())
+        elif self._parse_flush_task is None:
+            self._parse_flush_task = asyncio.create_task(self._flush_parse_queue(PARSE_BATCH_WINDOW))
+        
+        return await future
+    
+    async def _flush_parse_queue(self, delay: float = 0):
+        """Parse every queued reminder request and resolve their futures."""
+        if delay:
+            await asyncio.sleep(delay)
+        
+        batch = self._parse_queue[:PARSE_BATCH_MAX]
+        del self._parse_queue[:PARSE_BATCH_MAX]
+        self._parse_flush_task = None
+        
+        # Leave anything over the batch limit for the next call
+        if self._parse_queue:
+            delay = 0 if len(self._parse_queue) >= PARSE_BATCH_MAX else PARSE_BATCH_WINDOW
+            self._parse_flush_task = asyncio.create_task(self._flush_parse_queue(delay))
+        
+        results = await self.parse_reminder_requests_batch([message for message, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def parse_reminder_requests_batch(self, messages: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse several natural language reminder requests with one AI call.
+        
+        Args:
+            messages (List[str]): Natural language reminder requests
+            
+        Returns:
+            List[Optional[Dict]]: Parsed details for each message, in order,
+            with None for any that could not be parsed
+        """
+        results = [None] * len(messages)
+        if not self.gemini_model or not messages:
+            return results
         
         try:
             # Get current Phnom Penh time for context
             current_time = datetime.now(self.timezone)
-            current_time_str = current_time.strftime('%Y-%m-%d %H:%M:%S %A')
-            
-            prompt = f"""
-            Parse this reminder request and extract the following information:
-            
-            CURRENT TIME: {current_time_str} (Phnom Penh time, Cambodia - UTC+7)
-            
-            - reminder_text: What to remind about (the main message content)
-            - remind_time: When to send the reminder (use current time above for calculations)
-            - priority: urgent, normal, or low
-            
-            User request: "{user_message}"
-            
-            REMIND_TIME RULES:
-            - If user says "now", "immediately", "right away" → use "now"
-            - If user specifies time today → use "YYYY-MM-DD HH:MM" format with today's date
-            - If user says "tomorrow at X" → use tomorrow's date with specified time
-            - If user says "in X minutes/hours" → calculate from current time
-            - If user says "at X PM/AM" without date → assume today if time hasn't passed, tomorrow if it has
-            - If user says specific date → use that date
-            - If no time specified → use "now"
             
-            EXAMPLES:
-            "at 2PM today, you have to notify me that I need to do home work" → remind_time: "2025-05-31 14:00", reminder_text: "Time to do your homework!"
-            "remind me in 30 minutes to call mom" → calculate 30 minutes from current time, reminder_text: "Time to call mom!"
-            "at 1:20PM notify me that I need to play chess" → remind_time: "2025-05-31 13:20", reminder_text: "Time to play chess!"
-            "tomorrow at 9 AM remind me about the meeting" → remind_time: "2025-06-01 09:00", reminder_text: "Don't forget about the meeting!"
+            user_requests = "\n".join(f'{i}. "{message}"' for i, message in enumerate(messages, 1))
+            prompt = _REMINDER_PROMPT_TEMPLATE.format(
+                current_time=current_time.strftime('%Y-%m-%d %H:%M:%S %A'),
+                user_requests=user_requests,
+                count=len(messages)
+            )
             
-            Return ONLY a JSON object with these fields:
-            {{
-                "reminder_text": "Friendly reminder message to send",
-                "remind_time": "now" or "YYYY-MM-DD HH:MM",
-                "priority": "normal"
-            }}
-            """
-            
-            response = self.gemini_model.generate_content(prompt)
+            # Run the blocking Gemini call off the event loop
+            async with self._gemini_sem:
+                response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
             
             if response and response.text:
-                # Clean up response and parse JSON
-                response_text = response.text.strip()
-                
-                # Remove markdown code blocks if present
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:]
-                if response_text.startswith('```'):
-                    response_text = response_text[3:]
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]
+                # Remove markdown code fences if present, then parse JSON
+                response_text = _FENCE_RE.sub('', response.text.strip())
                 
-                reminder_data = json.loads(response_text.strip())
+                parsed = _json_loads(response_text)
+                if isinstance(parsed, dict):
+                    parsed = [parsed]
                 
-                # Validate required fields
-                if not reminder_data.get('reminder_text') or not reminder_data.get('remind_time'):
-                    return None
+                for i, reminder_data in enumerate(parsed[:len(messages)]):
+                    # Validate required fields
+                    if isinstance(reminder_data, dict) and reminder_data.get('reminder_text') and reminder_data.get('remind_time'):
+                        results[i] = reminder_data
                 
-                logger.info(f"Successfully parsed reminder request")
-                return reminder_data
+                logger.debug("Parsed %d/%d reminder requests", len(messages) - results.count(None), len(messages))
                 
         except (json.JSONDecodeError, KeyError, Exception) as e:
-            logger.error(f"Error parsing reminder request: {e}")
-            return None
+            logger.error(f"Error parsing reminder requests: {e}")
+        
+        return results
     
     def parse_remind_time(self, remind_time_str: str) -> Optional[datetime]:
         """
@@ -129,44 +255,34 @@ class ReminderService:
         if not remind_time_str or remind_time_str.lower() == "now":
             return datetime.now(self.timezone)
         
-        logger.info(f"Attempting to parse remind_time: '{remind_time_str}'")
+        logger.debug("Attempting to parse remind_time: %r", remind_time_str)
         
         try:
             # Remove any extra whitespace
             remind_time_str = remind_time_str.strip()
             
-            # Try parsing YYYY-MM-DD HH:MM format
-            if len(remind_time_str) == 16 and ' ' in remind_time_str:  # "2024-01-15 14:30"
-                try:
-                    dt = datetime.strptime(remind_time_str, '%Y-%m-%d %H:%M')
-                    result = self.timezone.localize(dt)
-                    logger.info(f"Successfully parsed YYYY-MM-DD HH:MM format: {result}")
-                    return result
-                except ValueError:
-                    pass
+            # Fast paths for the formats Gemini is asked to produce
+            match = _DATETIME_RE.fullmatch(remind_time_str)  # "2024-01-15 14:30"
+            if match:
+                year, month, day, hour, minute = map(int, match.groups())
+                result = datetime(year, month, day, hour, minute, tzinfo=self.timezone)
+                logger.debug("Successfully parsed YYYY-MM-DD HH:MM format: %s", result)
+                return result
             
-            # Try parsing YYYY-MM-DD format (assume noon)
-            if len(remind_time_str) == 10 and '-' in remind_time_str:  # "2024-01-15"
-                try:
-                    dt = datetime.strptime(remind_time_str, '%Y-%m-%d')
-                    dt = dt.replace(hour=12)  # Default to noon
-                    result = self.timezone.localize(dt)
-                    logger.info(f"Successfully parsed YYYY-MM-DD format (noon): {result}")
-                    return result
-                except ValueError:
-                    pass
+            match = _DATE_RE.fullmatch(remind_time_str)  # "2024-01-15"
+            if match:
+                year, month, day = map(int, match.groups())
+                result = datetime(year, month, day, 12, tzinfo=self.timezone)  # Default to noon
+                logger.debug("Successfully parsed YYYY-MM-DD format (noon): %s", result)
+                return result
             
-            # Try parsing HH:MM format (assume today)
-            if ':' in remind_time_str and len(remind_time_str) <= 5:  # "14:30"
-                try:
-                    today = datetime.now(self.timezone).date()
-                    time_part = datetime.strptime(remind_time_str, '%H:%M').time()
-                    dt = datetime.combine(today, time_part)
-                    result = self.timezone.localize(dt)
-                    logger.info(f"Successfully parsed HH:MM format (today): {result}")
-                    return result
-                except ValueError:
-                    pass
+            match = _TIME_RE.fullmatch(remind_time_str)  # "14:30", assume today
+            if match:
+                hour, minute = map(int, match.groups())
+                today = datetime.now(self.timezone).date()
+                result = datetime(today.year, today.month, today.day, hour, minute, tzinfo=self.timezone)
+                logger.debug("Successfully parsed HH:MM format (today): %s", result)
+                return result
             
             # Try parsing more flexible formats
             formats_to_try = [
@@ -181,8 +297,8 @@ class ReminderService:
             for fmt in formats_to_try:
                 try:
                     dt = datetime.strptime(remind_time_str, fmt)
-                    result = self.timezone.localize(dt)
-                    logger.info(f"Successfully parsed with format '{fmt}': {result}")
+                    result = dt.replace(tzinfo=self.timezone)
+                    logger.debug("Successfully parsed with format %r: %s", fmt, result)
                     return result
                 except ValueError:
                     continue
@@ -206,8 +322,11 @@ class ReminderService:
         Returns:
             str: Unique reminder ID
         """
-        # Generate unique ID
-        reminder_id = f"reminder_{int(datetime.now().timestamp())}"
+        created_time = datetime.now(self.timezone)
+        
+        # Generate unique ID (batched parses resolve together, so several
+        # reminders can be saved within the same second)
+        reminder_id = f"reminder_{uuid.uuid4().hex}"
         
         # Prepare reminder record
         reminder_record = {
@@ -215,7 +334,9 @@ class ReminderService:
             "reminder_text": reminder_data['reminder_text'],
             "priority": reminder_data.get('priority', 'normal'),
             "scheduled_time": scheduled_time.isoformat(),
-            "created_time": datetime.now(self.timezone).isoformat(),
+            "scheduled_ts": scheduled_time.timestamp(),
+            "created_time": created_time.isoformat(),
+            "created_ts": created_time.timestamp(),
             "status": "pending"
         }
         
@@ -226,21 +347,140 @@ class ReminderService:
         pending_reminders[reminder_id] = reminder_record
         
         # Save back to file
-        with open(self.pending_reminders_file, 'w') as f:
-            json.dump(pending_reminders, f, indent=2)
+        self._write_pending_reminders(pending_reminders)
+        
+        if self._on_due:
+            self.schedule_reminder(reminder_id, scheduled_time, self._on_due)
         
-        logger.info(f"Reminder {reminder_id} saved for scheduled sending at {scheduled_time}")
+        logger.info("Reminder %s saved for scheduled sending at %s", reminder_id, scheduled_time)
         return reminder_id
     
+    def schedule_reminder(self, reminder_id: str, scheduled_time: datetime, coro_factory: Callable[[str], Awaitable[None]]):
+        """
+        Arm a timer that runs coro_factory(reminder_id) at the scheduled time.
+        
+        Args:
+            reminder_id (str): Reminder to fire
+            scheduled_time (datetime): When to fire it
+            coro_factory: Async callable taking the reminder ID
+        """
+        delay = max((scheduled_time - datetime.now(self.timezone)).total_seconds(), 0)
+        
+        old_handle = self._handles.pop(reminder_id, None)
+        if old_handle:
+            old_handle.cancel()
+        
+        loop = asyncio.get_running_loop()
+        self._handles[reminder_id] = loop.call_later(delay, self._fire, reminder_id, coro_factory)
+    
+    def _fire(self, reminder_id: str, coro_factory: Callable[[str], Awaitable[None]]):
+        """Start the send task for a reminder whose timer has expired."""
+        self._handles.pop(reminder_id, None)
+        task = asyncio.create_task(coro_factory(reminder_id))
+        self._fire_tasks.add(task)
+        task.add_done_callback(self._fire_tasks.discard)
+    
+    def start_timers(self, coro_factory: Callable[[str], Awaitable[None]]) -> int:
+        """
+        Arm timers for every stored pending reminder and for new ones.
+        
+        Must be called from inside the running event loop, normally once at
+        startup so reminders saved before a restart still fire on time.
+        
+        Args:
+            coro_factory: Async callable taking the reminder ID
+            
+        Returns:
+            int: Number of reminders scheduled
+        """
+        self._on_due = coro_factory
+        
+        pending = self.get_pending_reminders()
+        for reminder in pending:
+            scheduled_time = datetime.fromisoformat(reminder['scheduled_time'])
+            self.schedule_reminder(reminder['id'], scheduled_time, coro_factory)
+        
+        logger.info(f"Scheduled timers for {len(pending)} pending reminders")
+        return len(pending)
+    
+    def claim_reminder(self, reminder_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Mark a pending reminder as sent and return it for delivery.
+        
+        Args:
+            reminder_id (str): Reminder to claim
+            
+        Returns:
+            Dict: Reminder details, or None if it is no longer pending
+        """
+        pending_reminders = self.load_pending_reminders()
+        reminder_data = pending_reminders.get(reminder_id)
+        
+        if not reminder_data or reminder_data['status'] != 'pending':
+            return None
+        
+        current_time = datetime.now(self.timezone)
+        reminder_data['status'] = 'sent'
+        reminder_data['sent_time'] = current_time.isoformat()
+        self._write_pending_reminders(pending_reminders)
+        
+        return {
+            "reminder_id": reminder_id,
+            "reminder_text": reminder_data['reminder_text'],
+            "priority": reminder_data.get('priority', 'normal'),
+            "scheduled_time": datetime.fromisoformat(reminder_data['scheduled_time'])
+        }
+    
     def load_pending_reminders(self) -> Dict[str, Any]:
-        """Load pending reminders from file."""
-        if os.path.exists(self.pending_reminders_file):
+        """
+        Load pending reminders, reading the file only on first use.
+        
+        The returned dict is the shared cache; callers that change it must
+        pass it to _write_pending_reminders.
+        """
+        if self._cache is None:
+            self._cache = {}
+            if os.path.exists(self.pending_reminders_file):
+                try:
+                    with open(self.pending_reminders_file, 'rb') as f:
+                        self._cache = _json_loads(f.read())
+                except (json.JSONDecodeError, FileNotFoundError):
+                    pass
+        return self._cache
+    
+    def _write_pending_reminders(self, pending_reminders: Dict[str, Any]):
+        """
+        Atomically write the full reminder store back to file.
+        
+        The data is written and fsynced to a temporary file that then replaces
+        the store, keeping the store's existing permissions. If anything fails
+        the temporary file is removed and the cache is dropped, since callers
+        may already have changed it in place, so the next load re-reads disk.
+        """
+        directory = os.path.dirname(os.path.abspath(self.pending_reminders_file))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps(pending_reminders))
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # mkstemp creates the file as 0600; keep the store's own mode
+            try:
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self.pending_reminders_file).st_mode))
+            except FileNotFoundError:
+                pass
+            
+            os.replace(temp_path, self.pending_reminders_file)
+        except BaseException:
+            self._cache = None
             try:
-                with open(self.pending_reminders_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
+                os.unlink(temp_path)
+            except FileNotFoundError:
                 pass
-        return {}
+            raise
+        
+        self._cache = pending_reminders
     
     def get_pending_reminders(self) -> List[Dict[str, Any]]:
         """Get all pending reminders sorted by scheduled time."""
@@ -256,14 +496,18 @@ class ReminderService:
         pending_list.sort(key=lambda x: x['scheduled_time'])
         return pending_list
     
-    async def check_and_send_scheduled_reminders(self) -> List[Dict[str, Any]]:
+    async def check_and_send_scheduled_reminders(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Check for reminders that need to be sent and return them.
         
+        Args:
+            now (datetime, optional): Current time, computed if not given
+        
         Returns:
             List[Dict]: List of reminders that should be sent now
         """
-        current_time = datetime.now(self.timezone)
+        current_time = now.astimezone(self.timezone) if now else datetime.now(self.timezone)
+        now_ts = current_time.timestamp()
         pending_reminders = self.load_pending_reminders()
         reminders_to_send = []
         
@@ -272,24 +516,25 @@ class ReminderService:
                 continue
             
             # Check if it's time to send
-            scheduled_time = datetime.fromisoformat(reminder_data['scheduled_time'])
-            
-            if scheduled_time <= current_time:
+            if self._record_ts(reminder_data, 'scheduled') <= now_ts:
                 # Mark as sent
                 reminder_data['status'] = 'sent'
                 reminder_data['sent_time'] = current_time.isoformat()
                 
+                handle = self._handles.pop(reminder_id, None)
+                if handle:
+                    handle.cancel()
+                
                 reminders_to_send.append({
                     "reminder_id": reminder_id,
                     "reminder_text": reminder_data['reminder_text'],
                     "priority": reminder_data.get('priority', 'normal'),
-                    "scheduled_time": scheduled_time
+                    "scheduled_time": datetime.fromisoformat(reminder_data['scheduled_time'])
                 })
         
         # Save updated pending reminders
         if reminders_to_send:
-            with open(self.pending_reminders_file, 'w') as f:
-                json.dump(pending_reminders, f, indent=2)
+            self._write_pending_reminders(pending_reminders)
         
         return reminders_to_send
     
@@ -299,9 +544,11 @@ class ReminderService:
         
         if reminder_id in pending_reminders and pending_reminders[reminder_id]['status'] == 'pending':
             pending_reminders[reminder_id]['status'] = 'cancelled'
+            self._write_pending_reminders(pending_reminders)
             
-            with open(self.pending_reminders_file, 'w') as f:
-                json.dump(pending_reminders, f, indent=2)
+            handle = self._handles.pop(reminder_id, None)
+            if handle:
+                handle.cancel()
             
             logger.info(f"Reminder {reminder_id} cancelled")
             return True
@@ -310,24 +557,36 @@ class ReminderService:
     
     def cleanup_old_reminders(self, days_old: int = 7):
         """Clean up old sent/cancelled reminders."""
-        cutoff_date = datetime.now(self.timezone) - timedelta(days=days_old)
         pending_reminders = self.load_pending_reminders()
+        if not any(r['status'] in ('sent', 'cancelled') for r in pending_reminders.values()):
+            return
         
-        reminders_to_remove = []
-        for reminder_id, reminder_data in pending_reminders.items():
-            if reminder_data['status'] in ['sent', 'cancelled']:
-                created_time = datetime.fromisoformat(reminder_data['created_time'])
-                if created_time < cutoff_date:
-                    reminders_to_remove.append(reminder_id)
+        cutoff_ts = (datetime.now(self.timezone) - timedelta(days=days_old)).timestamp()
         
-        for reminder_id in reminders_to_remove:
-            del pending_reminders[reminder_id]
+        kept_reminders = {
+            reminder_id: reminder_data
+            for reminder_id, reminder_data in pending_reminders.items()
+            if not (reminder_data['status'] in ('sent', 'cancelled')
+                    and self._record_ts(reminder_data, 'created') < cutoff_ts)
+        }
         
-        if reminders_to_remove:
-            with open(self.pending_reminders_file, 'w') as f:
-                json.dump(pending_reminders, f, indent=2)
-            
-            logger.info(f"Cleaned up {len(reminders_to_remove)} old reminders")
+        removed_count = len(pending_reminders) - len(kept_reminders)
+        if removed_count:
+            self._write_pending_reminders(kept_reminders)
+            logger.info(f"Cleaned up {removed_count} old reminders")
+    
+    @staticmethod
+    def _record_ts(reminder_data: Dict[str, Any], field: str) -> float:
+        """
+        Get a record's 'created' or 'scheduled' time as a Unix timestamp.
+        
+        Falls back to parsing the ISO string for records saved before the
+        *_ts fields existed.
+        """
+        ts = reminder_data.get(f'{field}_ts')
+        if ts is None:
+            ts = datetime.fromisoformat(reminder_data[f'{field}_time']).timestamp()
+        return ts
     
     def format_reminder_message(self, reminder_text: str) -> str:
         """
@@ -343,18 +602,7 @@ class ReminderService:
     
     def _get_encouraging_message(self) -> str:
         """Get a random encouraging message to add to reminders."""
-        import random
-        messages = [
-            "You know, balancing work and studies can be tricky, but you've totally got this!",
-            "Perfect timing! Hope you're having a productive day!",
-            "Time flies when you're coding, doesn't it? 😄",
-            "Another step towards your goals - keep it up!",
-            "Hope this reminder finds you in a good mood!",
-            "You're doing great managing everything, Bunkheang!",
-            "Let's tackle this next task together!",
-            "Remember, every small step counts towards your big dreams!"
-        ]
-        return random.choice(messages)
+        return random.choice(_ENCOURAGING_MESSAGES)
     
     def format_reminder_preview(self, reminder_data: Dict[str, Any]) -> str:
         """Format reminder data for preview."""
@@ -363,4 +611,14 @@ class ReminderService:
             f"📝 **Message:** {reminder_data['reminder_text']}\n"
             f"⏰ **Remind Time:** {reminder_data['remind_time']}\n"
             f"🔹 **Priority:** {reminder_data.get('priority', 'normal').title()}"
-        ) 
\ No newline at end of file
+        ) 
+
+# Shared instance so the scheduler and chat handlers use the same store
+_reminder_service = None
+
+def get_reminder_service() -> ReminderService:
+    """Get the shared reminder service, creating it on first use."""
+    global _reminder_service
+    if _reminder_service is None:
+        _reminder_service = ReminderService()
+    return _reminder_service
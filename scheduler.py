@@ -1,17 +1,41 @@
 import logging
+import asyncio
+import time
+from datetime import datetime, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from config import DAILY_MESSAGE_HOUR, DAILY_MESSAGE_MINUTE, ENABLE_CALENDAR_REMINDERS, REMINDER_CHECK_INTERVAL_MINUTES, ENABLE_EMAIL_AUTOMATION
-from handlers import send_daily_hi, send_calendar_reminders, send_scheduled_emails, send_scheduled_reminders
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from config import DAILY_MESSAGE_HOUR, DAILY_MESSAGE_MINUTE, ENABLE_CALENDAR_REMINDERS, REMINDER_CHECK_INTERVAL_MINUTES, ENABLE_EMAIL_AUTOMATION, ENABLE_ENHANCED_DAILY
+from handlers import send_daily_hi, send_calendar_reminders, send_scheduled_emails, send_scheduled_reminders, send_reminder, get_services
+from reminder_service import get_reminder_service
 
 logger = logging.getLogger(__name__)
 
+# Minutes before the daily message to refresh the weather and quote caches
+DAILY_WARMUP_LEAD_MINUTES = 5
+
+# Minutes between safety-net sweeps for personal reminders whose timers were missed
+REMINDER_SWEEP_INTERVAL_MINUTES = 5
+
 class BotScheduler:
-    """Handles scheduling of daily messages and other recurring tasks."""
+    """
+    Handles scheduling of daily messages and other recurring tasks.
+    
+    Jobs are coroutines that run on the bot's event loop and must not block it.
+    """
     
     def __init__(self):
         """Initialize the scheduler."""
-        self.scheduler = AsyncIOScheduler()
+        self.scheduler = AsyncIOScheduler(
+            executors={'default': AsyncIOExecutor()},
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': 30
+            }
+        )
         self.is_running = False
+        self._tick_count = 0
+        self._minute_task = None
         logger.info("Scheduler initialized")
     
     def setup_daily_messages(self, application):
@@ -21,107 +45,101 @@ class BotScheduler:
         Args:
             application: The Telegram application instance
         """
-        try:
-            # Add the daily hi message job
+        # Add the daily hi message job
+        self.scheduler.add_job(
+            send_daily_hi,
+            'cron',
+            hour=DAILY_MESSAGE_HOUR,
+            minute=DAILY_MESSAGE_MINUTE,
+            args=[application],
+            id='daily_hi_message',
+            name='Daily Hi Message',
+            replace_existing=True,
+            misfire_grace_time=3600  # Still send if we restart within the hour
+        )
+        
+        logger.info(f"Daily message job scheduled for {DAILY_MESSAGE_HOUR:02d}:{DAILY_MESSAGE_MINUTE:02d}")
+        
+        if ENABLE_ENHANCED_DAILY:
+            # Refresh the caches shortly before so the daily message is served from them
+            warmup_hour, warmup_minute = divmod(
+                (DAILY_MESSAGE_HOUR * 60 + DAILY_MESSAGE_MINUTE - DAILY_WARMUP_LEAD_MINUTES) % (24 * 60), 60
+            )
             self.scheduler.add_job(
-                send_daily_hi,
+                get_services().warm_up,
                 'cron',
-                hour=DAILY_MESSAGE_HOUR,
-                minute=DAILY_MESSAGE_MINUTE,
-                args=[application],
-                id='daily_hi_message',
-                name='Daily Hi Message',
+                hour=warmup_hour,
+                minute=warmup_minute,
+                id='daily_cache_warmup',
+                name='Daily Cache Warm-up',
                 replace_existing=True
             )
-            
-            logger.info(f"Daily message job scheduled for {DAILY_MESSAGE_HOUR:02d}:{DAILY_MESSAGE_MINUTE:02d}")
-            
-        except Exception as e:
-            logger.error(f"Error setting up daily messages: {e}")
-            raise
 
-    def setup_calendar_reminders(self, application):
+    def setup_reminder_automation(self, application):
         """
-        Set up calendar reminder checking job.
+        Arm timers that fire each personal reminder at its scheduled time.
         
         Args:
             application: The Telegram application instance
         """
-        if not ENABLE_CALENDAR_REMINDERS:
-            logger.info("Calendar reminders disabled in config")
-            return
-            
-        try:
-            # Add calendar reminder checking job
-            self.scheduler.add_job(
-                send_calendar_reminders,
-                'interval',
-                minutes=REMINDER_CHECK_INTERVAL_MINUTES,
-                args=[application],
-                id='calendar_reminders',
-                name='Calendar Reminders Check',
-                replace_existing=True
-            )
-            
-            logger.info(f"Calendar reminder job scheduled (checking every {REMINDER_CHECK_INTERVAL_MINUTES} minutes)")
-            
-        except Exception as e:
-            logger.error(f"Error setting up calendar reminders: {e}")
-            raise
+        get_reminder_service().start_timers(
+            lambda reminder_id: send_reminder(application, reminder_id)
+        )
+        logger.info("Personal reminder timers armed")
 
-    def setup_email_automation(self, application):
+    def setup_periodic_checks(self, application):
         """
-        Set up email automation checking job.
+        Start a loop that runs every periodic check from a shared tick.
+        
+        Email checks run every minute, calendar reminder checks every
+        REMINDER_CHECK_INTERVAL_MINUTES and the personal reminder safety-net
+        sweep every REMINDER_SWEEP_INTERVAL_MINUTES. The loop runs directly on
+        the event loop rather than as an APScheduler job, since a fixed
+        one-minute interval needs none of its cron or misfire handling.
         
         Args:
             application: The Telegram application instance
         """
+        if not ENABLE_CALENDAR_REMINDERS:
+            logger.info("Calendar reminders disabled in config")
         if not ENABLE_EMAIL_AUTOMATION:
             logger.info("Email automation disabled in config")
-            return
-            
-        try:
-            # Add email checking job (every minute)
-            self.scheduler.add_job(
-                send_scheduled_emails,
-                'interval',
-                minutes=1,
-                args=[application],
-                id='email_automation',
-                name='Scheduled Email Check',
-                replace_existing=True
-            )
-            
-            logger.info("Email automation job scheduled (checking every minute)")
-            
-        except Exception as e:
-            logger.error(f"Error setting up email automation: {e}")
-            raise
+        
+        if self._minute_task is not None:
+            self._minute_task.cancel()
+        self._minute_task = asyncio.create_task(self._minute_loop(application))
+        
+        logger.info("Periodic check loop started (ticking every minute)")
 
-    def setup_reminder_automation(self, application):
-        """
-        Set up reminder automation checking job.
+    async def _minute_loop(self, application):
+        """Run a tick at the start of every wall-clock minute until cancelled."""
+        while True:
+            # Sleeping until the next boundary also skips ticks that a slow
+            # tick overran, so ticks never overlap
+            await asyncio.sleep(max(0, 60 - time.time() % 60))
+            try:
+                await self._tick(application)
+            except Exception:
+                logger.exception("Error in periodic checks")
+
+    async def _tick(self, application):
+        """Run the periodic checks that are due on this tick concurrently."""
+        self._tick_count += 1
+        # One shared timestamp so every check agrees on what is due
+        now = datetime.now(timezone.utc)
         
-        Args:
-            application: The Telegram application instance
-        """
-        try:
-            # Add reminder checking job (every minute)
-            self.scheduler.add_job(
-                send_scheduled_reminders,
-                'interval',
-                minutes=1,
-                args=[application],
-                id='reminder_automation',
-                name='Scheduled Reminder Check',
-                replace_existing=True
-            )
-            
-            logger.info("Reminder automation job scheduled (checking every minute)")
-            
-        except Exception as e:
-            logger.error(f"Error setting up reminder automation: {e}")
-            raise
+        checks = []
+        if ENABLE_EMAIL_AUTOMATION:
+            checks.append(send_scheduled_emails(application, now=now))
+        if ENABLE_CALENDAR_REMINDERS and self._tick_count % REMINDER_CHECK_INTERVAL_MINUTES == 0:
+            checks.append(send_calendar_reminders(application, now=now))
+        if self._tick_count % REMINDER_SWEEP_INTERVAL_MINUTES == 0:
+            checks.append(send_scheduled_reminders(application, now=now))
+        
+        results = await asyncio.gather(*checks, return_exceptions=True)
+        for check, result in zip(checks, results):
+            if isinstance(result, Exception):
+                logger.error("Error in periodic check %s: %s", check.__name__, result, exc_info=result)
 
     def setup_all_jobs(self, application):
         """
@@ -131,9 +149,8 @@ class BotScheduler:
             application: The Telegram application instance
         """
         self.setup_daily_messages(application)
-        self.setup_calendar_reminders(application)
-        self.setup_email_automation(application)
         self.setup_reminder_automation(application)
+        self.setup_periodic_checks(application)
 
     def start(self):
         """Start the scheduler."""
@@ -152,6 +169,10 @@ class BotScheduler:
     def stop(self):
         """Stop the scheduler."""
         try:
+            if self._minute_task is not None:
+                self._minute_task.cancel()
+                self._minute_task = None
+            
             if self.is_running:
                 self.scheduler.shutdown()
                 self.is_running = False
@@ -1,30 +1,143 @@
 import logging
-import requests
+import re
+import time
+import asyncio
+import httpx
 import json
-from datetime import datetime
-import pytz
+from collections import deque
+from functools import lru_cache
 from config import (
     WEATHER_API_KEY, 
     DEFAULT_CITY, 
     WEATHER_API_URL, 
     QUOTES_API_URL, 
+    QUOTES_BATCH_API_URL,
     FACTS_API_URL,
     ENABLE_WEATHER
 )
 
+# orjson parses API responses faster when installed; fall back to the stdlib otherwise
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Weather description keywords and their emoji. "partly cloudy" comes
+# before "cloudy" so the longer phrase wins.
+_WEATHER_EMOJIS = {
+    "partly cloudy": "⛅",
+    "thunderstorm": "⛈️",
+    "storm": "⛈️",
+    "sunny": "☀️",
+    "clear": "☀️",
+    "overcast": "☁️",
+    "cloudy": "☁️",
+    "drizzle": "🌧️",
+    "rain": "🌧️",
+    "snow": "🌨️",
+    "fog": "🌫️",
+    "mist": "🌫️",
+}
+_WEATHER_KEYWORD_RE = re.compile("|".join(_WEATHER_EMOJIS), re.IGNORECASE)
+
+@lru_cache(maxsize=128)
+def _description_to_emoji(desc_lower: str) -> str:
+    """Pick the emoji for a lowercased weather description (the API uses a small vocabulary)."""
+    match = _WEATHER_KEYWORD_RE.search(desc_lower)
+    return _WEATHER_EMOJIS[match.group(0)] if match else "🌤️"
+
+# Weather message layout, filled in with str.format_map
+_WEATHER_TEMPLATE = (
+    "{emoji} **Weather in {city}, {country}**\n\n"
+    "🌡️ **Temperature:** {temperature}°C (feels like {feels_like}°C)\n"
+    "💧 **Humidity:** {humidity}%\n"
+    "🍃 **Wind:** {wind_speed} km/h\n"
+    "📝 **Description:** {description}"
+)
+
+# Greeting for each UTC hour of the day
+_GREETING_BY_HOUR = tuple(
+    "🌅 Good morning" if 5 <= hour < 12 else
+    "☀️ Good afternoon" if 12 <= hour < 17 else
+    "🌆 Good evening" if 17 <= hour < 21 else
+    "🌙 Good night"
+    for hour in range(24)
+)
+
+# Timeout in seconds for external API requests
+REQUEST_TIMEOUT = 10
+
+# How long successful weather responses are reused, in seconds
+WEATHER_CACHE_TTL = 600
+
+# Quotes are prefetched in batches and handed out one at a time
+QUOTE_BATCH_SIZE = 50
+QUOTE_REFILL_THRESHOLD = 10
+
 class ExternalServices:
     """Handles external API calls for weather, quotes, facts, etc."""
     
     def __init__(self):
         """Initialize the services handler."""
-        self.session = requests.Session()
-        self.session.timeout = 10
+        # Non-blocking client with pooled keep-alive connections; HTTP/2
+        # multiplexes concurrent requests to the same host over one connection
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+        )
+        
+        # Recent successful responses and requests still in flight, keyed by request
+        self._cache = {}
+        self._inflight = {}
+        
+        # ETags of the last weather response per city, for conditional requests
+        self._etags = {}
+        
+        # Formatted weather messages per city, as (timestamp of the weather
+        # response they were built from, message)
+        self._weather_messages = {}
+        
+        # Prefetched quotes, and references to background refills
+        self._quote_pool = deque()
+        self._background_tasks = set()
+    
+    async def _coalesce(self, key, fetch):
+        """
+        Run fetch() once for all concurrent callers asking for the same key.
+        
+        The first caller starts the request as a task; later callers await
+        that same task until it finishes.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def _cached(self, key, ttl, fetch):
+        """
+        Return a cached response, fetching it at most once per TTL window.
+        
+        Concurrent misses share one request. Failed responses are not cached.
+        """
+        entry = self._cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        
+        result = await self._coalesce(key, fetch)
+        if result.get("success"):
+            self._cache[key] = (time.monotonic(), result)
+        return result
     
     async def get_weather(self, city: str = None) -> dict:
         """
-        Get current weather information using WeatherStack API.
+        Get current weather information, reusing a recent response when available.
         
         Args:
             city (str): City name (defaults to DEFAULT_CITY)
@@ -32,14 +145,41 @@ class ExternalServices:
         Returns:
             dict: Weather information or error message
         """
+        city = city or DEFAULT_CITY
+        return await self._cached(("weather", city), WEATHER_CACHE_TTL, lambda: self._fetch_weather(city))
+    
+    async def formatted_weather(self, city: str = None) -> str:
+        """
+        Get the formatted weather message for a city, reusing a recent one.
+        
+        Args:
+            city (str): City name (defaults to DEFAULT_CITY)
+            
+        Returns:
+            str: Formatted weather message
+        """
+        city = city or DEFAULT_CITY
+        entry = self._weather_messages.get(city)
+        if entry and time.monotonic() - entry[0] < WEATHER_CACHE_TTL:
+            return entry[1]
+        
+        weather_data = await self.get_weather(city)
+        message = self.format_weather_message(weather_data)
+        
+        # Expire together with the cached response the message was built from
+        data_entry = self._cache.get(("weather", city))
+        if data_entry and data_entry[1] is weather_data:
+            self._weather_messages[city] = (data_entry[0], message)
+        return message
+    
+    async def _fetch_weather(self, city: str) -> dict:
+        """Fetch current weather for a city from the WeatherStack API."""
         if not ENABLE_WEATHER:
             return {
                 "success": False,
                 "message": "Weather service not configured"
             }
         
-        city = city or DEFAULT_CITY
-        
         try:
             params = {
                 'access_key': WEATHER_API_KEY,
@@ -47,10 +187,21 @@ class ExternalServices:
                 'units': 'm'  # metric units
             }
             
-            response = self.session.get(WEATHER_API_URL, params=params)
+            # Revalidate the previous response instead of downloading it again
+            cache_key = ("weather", city)
+            headers = {}
+            if city in self._etags and cache_key in self._cache:
+                headers['If-None-Match'] = self._etags[city]
+            
+            response = await self.client.get(WEATHER_API_URL, params=params, headers=headers)
+            
+            if response.status_code == 304:
+                logger.info(f"Weather data unchanged for {city}")
+                return self._cache[cache_key][1]
+            
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Check for WeatherStack API errors
             if 'error' in data:
@@ -74,10 +225,14 @@ class ExternalServices:
                 "wind_speed": current['wind_speed']
             }
             
+            etag = response.headers.get('ETag')
+            if etag:
+                self._etags[city] = etag
+            
             logger.info(f"Weather data retrieved for {city}")
             return weather_info
             
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error fetching weather: {e}")
             return {
                 "success": False,
@@ -92,16 +247,76 @@ class ExternalServices:
     
     async def get_inspirational_quote(self) -> dict:
         """
-        Get a random inspirational quote.
+        Get an inspirational quote from the prefetched pool.
+        
+        The pool is refilled in the background when it runs low; if it is
+        empty, a batch is fetched first and a single quote is the fallback.
         
         Returns:
             dict: Quote information or error message
         """
+        if not self._quote_pool:
+            await self.prefetch_quote_batch()
+        
+        if not self._quote_pool:
+            return await self._fetch_quote()
+        
+        quote_info = self._quote_pool.popleft()
+        
+        if len(self._quote_pool) < QUOTE_REFILL_THRESHOLD:
+            task = asyncio.create_task(self.prefetch_quote_batch())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        
+        return quote_info
+    
+    async def prefetch_quote_batch(self, count: int = QUOTE_BATCH_SIZE) -> int:
+        """
+        Fetch a batch of random quotes into the pool with one request.
+        
+        Args:
+            count (int): Number of quotes to request
+            
+        Returns:
+            int: Number of quotes added to the pool
+        """
+        return await self._coalesce(("quote_batch", None), lambda: self._fetch_quote_batch(count))
+    
+    async def _fetch_quote_batch(self, count: int) -> int:
+        """Fetch a batch of random quotes from the quotes API into the pool."""
+        try:
+            response = await self.client.get(QUOTES_BATCH_API_URL, params={'limit': count})
+            response.raise_for_status()
+            
+            data = _json_loads(response.content)
+            
+            self._quote_pool.extend(
+                {
+                    "success": True,
+                    "text": quote['content'],
+                    "author": quote['author'],
+                    "tags": quote.get('tags', [])
+                }
+                for quote in data
+            )
+            
+            logger.info(f"Prefetched {len(data)} inspirational quotes")
+            return len(data)
+            
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Error prefetching quotes: {e}")
+            return 0
+        except (KeyError, TypeError) as e:
+            logger.error(f"Unexpected quote batch API response format: {e}")
+            return 0
+    
+    async def _fetch_quote(self) -> dict:
+        """Fetch a random inspirational quote from the quotes API."""
         try:
-            response = self.session.get(QUOTES_API_URL)
+            response = await self.client.get(QUOTES_API_URL)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_loads(response.content)
             
             quote_info = {
                 "success": True,
@@ -113,7 +328,7 @@ class ExternalServices:
             logger.info("Inspirational quote retrieved")
             return quote_info
             
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error fetching quote: {e}")
             return {
                 "success": False,
@@ -130,14 +345,20 @@ class ExternalServices:
         """
         Get a random interesting fact.
         
+        Concurrent callers share one request; facts are not cached.
+        
         Returns:
             dict: Fact information or error message
         """
+        return await self._coalesce(("fact", None), self._fetch_fact)
+    
+    async def _fetch_fact(self) -> dict:
+        """Fetch a random fact from the facts API."""
         try:
-            response = self.session.get(FACTS_API_URL)
+            response = await self.client.get(FACTS_API_URL)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_loads(response.content)
             
             fact_info = {
                 "success": True,
@@ -148,7 +369,7 @@ class ExternalServices:
             logger.info("Random fact retrieved")
             return fact_info
             
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error fetching fact: {e}")
             return {
                 "success": False,
@@ -161,6 +382,26 @@ class ExternalServices:
                 "message": "Fact service temporarily unavailable"
             }
     
+    async def warm_up(self):
+        """
+        Prefill the weather cache for the default city and the quote pool.
+        
+        Failures are logged and otherwise ignored; the next request simply
+        fetches again.
+        """
+        results = await asyncio.gather(
+            self.get_weather(),
+            self.prefetch_quote_batch(),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Cache warm-up request failed: %s", result)
+    
+    async def close(self):
+        """Close the HTTP client and its pooled connections."""
+        await self.client.aclose()
+    
     def get_greeting_based_on_time(self) -> str:
         """
         Get an appropriate greeting based on current time.
@@ -168,24 +409,8 @@ class ExternalServices:
         Returns:
             str: Time-based greeting
         """
-        try:
-            # You can adjust timezone as needed
-            tz = pytz.timezone('UTC')
-            current_time = datetime.now(tz)
-            hour = current_time.hour
-            
-            if 5 <= hour < 12:
-                return "🌅 Good morning"
-            elif 12 <= hour < 17:
-                return "☀️ Good afternoon"
-            elif 17 <= hour < 21:
-                return "🌆 Good evening"
-            else:
-                return "🌙 Good night"
-                
-        except Exception as e:
-            logger.error(f"Error getting time-based greeting: {e}")
-            return "👋 Hello"
+        # Hours are in UTC; gmtime avoids building an aware datetime
+        return _GREETING_BY_HOUR[time.gmtime().tm_hour]
     
     def format_weather_message(self, weather_data: dict) -> str:
         """
@@ -200,31 +425,6 @@ class ExternalServices:
         if not weather_data["success"]:
             return f"❌ {weather_data['message']}"
         
-        # Simple weather emoji mapping based on description
-        description_lower = weather_data["description"].lower()
-        if "sunny" in description_lower or "clear" in description_lower:
-            weather_emoji = "☀️"
-        elif "cloudy" in description_lower or "overcast" in description_lower:
-            weather_emoji = "☁️"
-        elif "partly cloudy" in description_lower:
-            weather_emoji = "⛅"
-        elif "rain" in description_lower or "drizzle" in description_lower:
-            weather_emoji = "🌧️"
-        elif "snow" in description_lower:
-            weather_emoji = "🌨️"
-        elif "thunderstorm" in description_lower or "storm" in description_lower:
-            weather_emoji = "⛈️"
-        elif "fog" in description_lower or "mist" in description_lower:
-            weather_emoji = "🌫️"
-        else:
-            weather_emoji = "🌤️"
-        
-        message = (
-            f"{weather_emoji} **Weather in {weather_data['city']}, {weather_data['country']}**\n\n"
-            f"🌡️ **Temperature:** {weather_data['temperature']}°C (feels like {weather_data['feels_like']}°C)\n"
-            f"💧 **Humidity:** {weather_data['humidity']}%\n"
-            f"🍃 **Wind:** {weather_data['wind_speed']} km/h\n"
-            f"📝 **Description:** {weather_data['description']}"
-        )
+        weather_emoji = _description_to_emoji(weather_data["description"].lower())
         
-        return message 
\ No newline at end of file
+        return _WEATHER_TEMPLATE.format_map({**weather_data, "emoji": weather_emoji}) 
\ No newline at end of file